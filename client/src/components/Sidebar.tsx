@@ -1,7 +1,15 @@
+import { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { useNavigate, useLocation } from 'react-router-dom';
+import { publicAPI } from '../services/api';
 import '../styles/Sidebar.css';
 
+interface CategoryCount {
+  id: number;
+  name: string;
+  component_count: number;
+}
+
 interface SidebarProps {
   isOpen?: boolean;
 }
@@ -9,6 +17,24 @@ interface SidebarProps {
 export const Sidebar = ({ isOpen = true }: SidebarProps) => {
   const navigate = useNavigate();
   const location = useLocation();
+  const [counts, setCounts] = useState<Record<string, number>>({});
+
+  useEffect(() => {
+    const fetchCounts = async () => {
+      try {
+        const response = await publicAPI.getCategories(true);
+        const totals: Record<string, number> = {};
+        response.data.forEach((category: CategoryCount) => {
+          totals[category.name] = category.component_count;
+        });
+        setCounts(totals);
+      } catch (error) {
+        console.error('Error fetching category counts:', error);
+      }
+    };
+
+    fetchCounts();
+  }, []);
 
   const categories = [
     { name: 'Frontend', path: 'frontend' },
@@ -40,6 +66,9 @@ export const Sidebar = ({ isOpen = true }: SidebarProps) => {
           >
             <motion.span whileHover={{ x: 5 }} whileTap={{ scale: 0.95 }}>
               {category.name}
+              {counts[category.name] !== undefined && (
+                <span className="sidebar-count">{counts[category.name]}</span>
+              )}
             </motion.span>
           </button>
         ))}
@@ -10,6 +10,7 @@ interface CodeSnippet {
   filename: string;
   language: string;
   code: string;
+  html?: string;
   created_at: string;
 }
 
@@ -34,7 +35,7 @@ export const ComponentDetailPage = () => {
     const fetchComponent = async () => {
       try {
         if (componentId) {
-          const response = await publicAPI.getComponentDetail(parseInt(componentId));
+          const response = await publicAPI.getComponentDetail(parseInt(componentId), 'html');
           setComponent(response.data);
         }
       } catch (error) {
@@ -120,7 +121,11 @@ export const ComponentDetailPage = () => {
                     </button>
                     </div>
                     <pre className="code-block">
-                      <code>{snippet.code}</code>
+                      {snippet.html ? (
+                        <code dangerouslySetInnerHTML={{ __html: snippet.html }} />
+                      ) : (
+                        <code>{snippet.code}</code>
+                      )}
                     </pre>
                   </motion.div>
                 </div>
@@ -20,13 +20,16 @@ api.interceptors.request.use((config) => {
 
 // Public API endpoints
 export const publicAPI = {
-  getCategories: () => api.get('/categories'),
+  getCategories: (includeCounts?: boolean) =>
+    api.get('/categories', { params: { include_counts: includeCounts } }),
   getComponents: (skip?: number, limit?: number) =>
     api.get('/components', { params: { skip, limit } }),
-  getComponentsByCategory: (categoryName: string) =>
-    api.get(`/categories/${categoryName}/components`),
-  getComponentDetail: (componentId: number) =>
-    api.get(`/components/${componentId}`),
+  getComponentsByCategory: (categoryName: string, limit?: number, cursor?: string) =>
+    api.get(`/categories/${categoryName}/components`, { params: { limit, cursor } }),
+  getComponentDetail: (componentId: number, render?: 'html') =>
+    api.get(`/components/${componentId}`, { params: { render } }),
+  getComponentBatch: (componentIds: number[]) =>
+    api.get('/components/batch', { params: { ids: componentIds.join(',') } }),
 };
 
 // Auth endpoints
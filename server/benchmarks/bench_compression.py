@@ -0,0 +1,86 @@
+"""Bytes on the wire and CPU per request for component detail under each encoding.
+
+Seeds a temporary catalog, then fetches component details in-process through
+the ASGI app with identity, gzip and br, once recompressing every response
+("cold") and once reusing precompressed bodies by ETag ("warm"). Run from the
+server directory:
+
+    python -m benchmarks.bench_compression --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--snippets", type=int, default=2000)
+    parser.add_argument("--per-component", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        # The app binds its engine at import time, so point it at the scratch DB first
+        os.environ["FOUNDRY_DATABASE_URL"] = url
+
+        from sqlalchemy import create_engine
+        from benchmarks.synthetic import seed
+        from model import Base
+
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.snippets, args.per_component, seed_value=1)
+        engine.dispose()
+
+        asyncio.run(run(args))
+
+
+async def run(args):
+    import httpx
+    from compression import compressed_cache
+    from database import async_engine
+    import main as app_module
+
+    component_count = max(1, args.snippets // args.per_component)
+    transport = httpx.ASGITransport(app=app_module.app)
+    cases = [("identity", "identity", True), ("gzip", "gzip", False), ("gzip", "gzip", True),
+             ("br", "br", False), ("br", "br", True)]
+
+    paths = [f"/api/components/{i}" for i in range(1, min(component_count, 200) + 1)]
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Fill the response cache so every case measures encoding cost, not queries
+        for path in paths:
+            await client.get(path, headers={"Accept-Encoding": "identity"})
+
+        for label, accept, warm in cases:
+            rng = random.Random(1)
+            compressed_cache.clear()
+            wire_bytes = 0
+            started_cpu = time.process_time()
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                if not warm:
+                    compressed_cache.clear()
+                path = rng.choice(paths)
+                async with client.stream("GET", path, headers={"Accept-Encoding": accept}) as response:
+                    # Raw bytes as sent, before httpx decodes them
+                    async for chunk in response.aiter_raw():
+                        wire_bytes += len(chunk)
+            cpu = time.process_time() - started_cpu
+            elapsed = time.perf_counter() - started
+            mode = "" if accept == "identity" else ("warm" if warm else "cold")
+            print(
+                f"{label:8} {mode:4}  {wire_bytes / args.requests:9.0f} B/req  "
+                f"{cpu / args.requests * 1000:6.3f} ms CPU/req  {args.requests / elapsed:8.1f} req/s"
+            )
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
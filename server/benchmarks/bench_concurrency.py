@@ -0,0 +1,176 @@
+"""Load test: request throughput of a local uvicorn worker at rising concurrency.
+
+Seeds a temporary SQLite catalog, starts one uvicorn worker against it with the
+response cache disabled (so every request reaches the database) and drives the
+component detail endpoint at each concurrency level. Run from the server directory:
+
+    python -m benchmarks.bench_concurrency --levels 1 8 32
+
+A local SQLite file answers in microseconds, so on its own the run is CPU-bound
+and throughput cannot rise with concurrency however the handlers wait. To show
+what the async request path buys against a networked database, --db-latency-ms
+adds a round trip to every statement, run in two modes:
+
+    blocking  the wait runs on the event loop thread, as it did when handlers
+              called a sync Session, so the worker serves one query at a time
+    async     the wait runs in the driver's thread while the loop is free, as
+              with aiosqlite or asyncpg awaiting the server
+
+Recorded on one CPU shared by client and server, --db-latency-ms 5, 5000 snippets,
+5 s per level (req/s, p99 latency):
+
+    mode      concurrency 1     concurrency 8      concurrency 32
+    blocking  47 req/s  33 ms   47 req/s  517 ms   45 req/s  1413 ms
+    async     37 req/s  49 ms   105 req/s 172 ms   108 req/s  476 ms
+
+The blocking mode stays flat because the worker waits out one round trip at a
+time. The async mode overlaps the waits until the single CPU becomes the limit,
+which with --db-latency-ms 0 holds throughput near 115-120 req/s at every level.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine, event
+
+from benchmarks.synthetic import seed
+from model import Base
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+MODES = ("blocking", "async")
+
+
+def add_round_trip(sync_engine, latency_ms: float, mode: str):
+    """Make every statement on an aiosqlite-backed engine wait latency_ms, on or off the event loop"""
+    delay = latency_ms / 1000
+    if mode == "blocking":
+        # Cursor events run on the loop thread, so the sleep stalls every request in the worker
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def block_event_loop(conn, cursor, statement, parameters, context, executemany):
+            time.sleep(delay)
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def wait_in_driver_thread(dbapi_connection, connection_record):
+        # sqlite3 calls its trace callback from aiosqlite's worker thread as each statement runs
+        dbapi_connection.driver_connection._conn.set_trace_callback(lambda statement: time.sleep(delay))
+
+
+def serve(port: int, latency_ms: float, mode: str):
+    """Run the app in this process, with the simulated database round trip installed"""
+    import uvicorn
+    from database import async_engine
+    from main import app
+
+    if latency_ms > 0:
+        add_round_trip(async_engine.sync_engine, latency_ms, mode)
+    uvicorn.run(app, port=port, log_level="warning")
+
+
+async def drive(base_url: str, concurrency: int, duration: float, component_count: int) -> dict:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    rng = random.Random(concurrency)
+
+    async def worker(client):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(f"/api/components/{rng.randint(1, component_count)}")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_mode(url: str, args, mode: str):
+    port = free_port()
+    env = dict(os.environ, FOUNDRY_DATABASE_URL=url, FOUNDRY_CACHE_MAX_ENTRIES="0")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.bench_concurrency", "--serve", str(port),
+            "--db-latency-ms", str(args.db_latency_ms), "--modes", mode
+        ],
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url)
+        component_count = max(1, args.snippets // args.per_component)
+        for level in args.levels:
+            result = asyncio.run(drive(base_url, level, args.duration, component_count))
+            print(
+                f"{mode:8}  concurrency {result['concurrency']:4}  {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--snippets", type=int, default=5000)
+    parser.add_argument("--per-component", type=int, default=5)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0, help="simulated round trip per statement, 0 for none")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.db_latency_ms, args.modes[0])
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.snippets, args.per_component, seed_value=1)
+        engine.dispose()
+
+        for mode in args.modes:
+            run_mode(url, args, mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Snippet storage saved by content-addressed blobs on a seeded catalog.
+
+Seeds a temporary catalog in which a fraction of snippets are copies of shared
+boilerplate files (Dockerfile, tsconfig.json, CI YAML), then reports snippet
+bytes as stored per row versus once per distinct body. Run from the server
+directory:
+
+    python -m benchmarks.bench_dedup --snippets 20000 --boilerplate 0.3
+"""
+import argparse
+import os
+import tempfile
+
+from sqlalchemy import create_engine
+
+from benchmarks.synthetic import seed
+from blobs import storage_report
+from model import Base
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snippets", type=int, default=20000)
+    parser.add_argument("--per-component", type=int, default=5)
+    parser.add_argument("--boilerplate", type=float, nargs="+", default=[0.0, 0.1, 0.3, 0.5])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for fraction in args.boilerplate:
+        with tempfile.TemporaryDirectory() as workdir:
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            seed(engine, args.snippets, args.per_component, args.seed, boilerplate_fraction=fraction)
+            with engine.connect() as conn:
+                report = storage_report(conn)
+            engine.dispose()
+        print(
+            f"boilerplate {fraction:4.0%}  {report['snippets']:6} snippets  {report['blobs']:6} blobs  "
+            f"per-row {report['logical_bytes'] / 1024:8.1f} KiB  deduplicated {report['stored_bytes'] / 1024:8.1f} KiB  "
+            f"saved {report['saved_bytes'] / max(report['logical_bytes'], 1):5.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
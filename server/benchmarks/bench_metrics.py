@@ -0,0 +1,72 @@
+"""Per-request cost of the metrics middleware and SQL statement listeners.
+
+Drives a bare ASGI app with and without MetricsMiddleware, and times a cheap
+SELECT on an in-memory SQLite engine with and without the cursor listeners.
+Run from the server directory:
+
+    python -m benchmarks.bench_metrics --rounds 20000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import create_engine, text
+
+from metrics import MetricsMiddleware, instrument_engine
+
+LOOP = asyncio.new_event_loop()
+SCOPE = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def discard(message):
+    pass
+
+
+def time_requests(app, rounds: int) -> float:
+    async def run():
+        for _ in range(rounds):
+            await app(dict(SCOPE), None, discard)
+
+    started = time.perf_counter()
+    LOOP.run_until_complete(run())
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def time_queries(instrumented: bool, rounds: int) -> float:
+    engine = create_engine("sqlite://")
+    if instrumented:
+        instrument_engine(engine)
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        connection.execute(statement)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            connection.execute(statement)
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    time_requests(bare_app, 1000)
+    time_requests(MetricsMiddleware(bare_app), 1000)
+    plain = time_requests(bare_app, args.rounds)
+    measured = time_requests(MetricsMiddleware(bare_app), args.rounds)
+    print(f"request  bare {plain:6.2f} us  with metrics {measured:6.2f} us  overhead {measured - plain:6.2f} us")
+
+    plain = time_queries(False, args.rounds)
+    measured = time_queries(True, args.rounds)
+    print(f"query    bare {plain:6.2f} us  with metrics {measured:6.2f} us  overhead {measured - plain:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
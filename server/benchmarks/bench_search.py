@@ -0,0 +1,77 @@
+"""Benchmark FTS5 search against a LIKE scan on a synthetic catalog.
+
+Run from the server directory:
+
+    python -m benchmarks.bench_search --snippets 100000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.synthetic import seed
+from model import Base
+from search import build_match_query, ensure_search_index, search_catalog
+
+QUERIES = ["kafka", "terraform pipeline", "session token", "reduc", "webhookHandler"]
+
+
+def time_call(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "max_ms": max(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snippets", type=int, default=100_000)
+    parser.add_argument("--per-component", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        seed(engine, args.snippets, args.per_component, args.seed)
+        print(f"seeded {args.snippets} snippets in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        ensure_search_index(engine)
+        print(f"built FTS5 index in {time.perf_counter() - started:.1f}s")
+
+        with engine.connect() as conn:
+            for query in QUERIES:
+                matches = conn.execute(
+                    text("SELECT count(*) FROM snippet_fts WHERE snippet_fts MATCH :match"),
+                    {"match": build_match_query(query)}
+                ).scalar()
+                fts = time_call(lambda: search_catalog(conn, query, limit=20), args.repeat)
+                like = time_call(
+                    lambda: conn.execute(
+                        # Unranked scan; every match must be read before it could be ranked
+                        text(
+                            "SELECT s.id FROM code_snippets s JOIN snippet_blobs b ON b.content_hash = s.content_hash "
+                            "WHERE s.filename LIKE :pattern OR b.code LIKE :pattern"
+                        ),
+                        {"pattern": f"%{query.split()[0]}%"}
+                    ).all(),
+                    args.repeat
+                )
+                print(
+                    f"{query!r:18} {matches:6} matches  fts5 median {fts['median_ms']:7.2f} ms  "
+                    f"(max {fts['max_ms']:7.2f})   like median {like['median_ms']:7.2f} ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
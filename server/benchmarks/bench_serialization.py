@@ -0,0 +1,85 @@
+"""Allocations and time to serialize a 100-item component page.
+
+Compares FastAPI's response_model path (validate the handler's dicts against
+List[ComponentResponse], dump them to JSON-compatible data, then json.dumps)
+with the fast path that encodes the same dicts straight to bytes. Run from the
+server directory:
+
+    python -m benchmarks.bench_serialization --items 100
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import schemas
+from serialization import dumps
+
+
+def page(items: int) -> list:
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return [
+        {
+            "id": i,
+            "title": f"Component {i}",
+            "use_case": "Reusable building block for the synthetic catalog " * 2,
+            "category": "Backend",
+            "created_at": now + timedelta(seconds=i),
+            "updated_at": now + timedelta(seconds=i, microseconds=7),
+        }
+        for i in range(items)
+    ]
+
+
+# One loop for every call so loop setup isn't billed to the response_model path
+LOOP = asyncio.new_event_loop()
+
+
+def response_model_path(field, rows) -> bytes:
+    content = LOOP.run_until_complete(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+
+def fast_path(field, rows) -> bytes:
+    return dumps(rows)
+
+
+def measure(fn, field, rows, rounds: int) -> dict:
+    fn(field, rows)
+    tracemalloc.start()
+    fn(field, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(field, rows)
+    elapsed = time.perf_counter() - started
+    return {"peak_bytes": peak, "us_per_page": elapsed / rounds * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    field = create_model_field("Response_list_components", List[schemas.ComponentResponse], mode="serialization")
+    rows = page(args.items)
+    assert response_model_path(field, rows) == fast_path(field, rows)
+
+    for name, fn in (("response_model", response_model_path), ("fast", fast_path)):
+        result = measure(fn, field, rows, args.rounds)
+        print(
+            f"{name:15} peak allocated {result['peak_bytes']:8d} B  {result['us_per_page']:8.1f} us/page"
+        )
+
+
+if __name__ == "__main__":
+    main()
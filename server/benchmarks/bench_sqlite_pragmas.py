@@ -0,0 +1,141 @@
+"""Mixed read/write load against SQLite with default and tuned connection pragmas.
+
+Seeds a temporary catalog for each profile, then runs reader threads fetching
+component details alongside writer threads inserting snippets, each on its own
+connection. Reports reads/s, writes/s, write p99 and `database is locked` errors.
+Run from the server directory:
+
+    python -m benchmarks.bench_sqlite_pragmas --readers 4 --writers 2
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.synthetic import seed
+from database import SQLITE_PRAGMAS, install_sqlite_pragmas
+from model import Base
+from snippets import snippet_metadata
+
+# SQLite's own defaults: rollback journal, FULL sync, no busy wait
+DEFAULT_PRAGMAS = {}
+
+DETAIL_SQL = text(
+    "SELECT c.id, c.title, s.id, s.filename, b.code FROM components c "
+    "LEFT JOIN code_snippets s ON s.component_id = c.id "
+    "LEFT JOIN snippet_blobs b ON b.content_hash = s.content_hash WHERE c.id = :id"
+)
+WRITER_CODE = "print('bench')\n" * 20
+WRITER_HASH = snippet_metadata(WRITER_CODE)["content_hash"]
+# Writers share one body, as the API would: add a reference, then the snippet row
+BLOB_SQL = text(
+    "INSERT INTO snippet_blobs (content_hash, code, byte_size, ref_count, created_at) "
+    "VALUES (:content_hash, :code, length(:code), 1, CURRENT_TIMESTAMP) "
+    "ON CONFLICT (content_hash) DO UPDATE SET ref_count = ref_count + 1"
+)
+INSERT_SQL = text(
+    "INSERT INTO code_snippets (component_id, filename, language, content_hash, created_at) "
+    "VALUES (:component_id, :filename, 'python', :content_hash, CURRENT_TIMESTAMP)"
+)
+UPDATE_SQL = text("UPDATE components SET updated_at = CURRENT_TIMESTAMP WHERE id = :id")
+
+
+def run_profile(name: str, pragmas: dict, args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        engine = create_engine(url, pool_size=args.readers + args.writers)
+        install_sqlite_pragmas(engine, pragmas)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.snippets, args.per_component, seed_value=1)
+        component_count = max(1, args.snippets // args.per_component)
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        write_latencies = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.duration
+
+        def record(key, latency=None):
+            with lock:
+                counts[key] += 1
+                if latency is not None:
+                    write_latencies.append(latency)
+
+        def reader(worker_id):
+            rng = random.Random(worker_id)
+            with engine.connect() as conn:
+                while time.perf_counter() < deadline:
+                    try:
+                        conn.execute(DETAIL_SQL, {"id": rng.randint(1, component_count)}).all()
+                        conn.commit()
+                        record("reads")
+                    except OperationalError:
+                        conn.rollback()
+                        record("locked")
+
+        def writer(worker_id):
+            rng = random.Random(1000 + worker_id)
+            with engine.connect() as conn:
+                while time.perf_counter() < deadline:
+                    component_id = rng.randint(1, component_count)
+                    started = time.perf_counter()
+                    try:
+                        conn.execute(BLOB_SQL, {"content_hash": WRITER_HASH, "code": WRITER_CODE})
+                        conn.execute(INSERT_SQL, {
+                            "component_id": component_id,
+                            "filename": f"bench_{worker_id}.py",
+                            "content_hash": WRITER_HASH,
+                        })
+                        conn.execute(UPDATE_SQL, {"id": component_id})
+                        conn.commit()
+                        record("writes", time.perf_counter() - started)
+                    except OperationalError:
+                        conn.rollback()
+                        record("locked")
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    write_latencies.sort()
+    return {
+        "profile": name,
+        "reads_per_s": counts["reads"] / elapsed,
+        "writes_per_s": counts["writes"] / elapsed,
+        "write_p50_ms": statistics.median(write_latencies) * 1000 if write_latencies else 0.0,
+        "write_p99_ms": write_latencies[max(0, int(len(write_latencies) * 0.99) - 1)] * 1000 if write_latencies else 0.0,
+        "locked_errors": counts["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--snippets", type=int, default=5000)
+    parser.add_argument("--per-component", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, pragmas in (("default", DEFAULT_PRAGMAS), ("tuned", SQLITE_PRAGMAS)):
+        result = run_profile(name, pragmas, args)
+        print(
+            f"{result['profile']:8}  {result['reads_per_s']:9.1f} reads/s  {result['writes_per_s']:8.1f} writes/s  "
+            f"write p50 {result['write_p50_ms']:7.2f} ms  p99 {result['write_p99_ms']:7.2f} ms  "
+            f"locked {result['locked_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
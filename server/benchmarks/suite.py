@@ -0,0 +1,301 @@
+"""API benchmark suite: public and admin scenarios in-process and over uvicorn.
+
+Seeds a temporary synthetic catalog, then drives each scenario at fixed
+concurrency levels, either in-process through the ASGI app or against a local
+uvicorn worker. Reports throughput, p50/p95/p99 latency and SQL queries per
+request as JSON, and can compare the run against a stored baseline. Run from
+the server directory:
+
+    python -m benchmarks.suite --mode both --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+The response cache is disabled unless --cache is given, so every request
+reaches the database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks.bench_concurrency import free_port, wait_until_up
+
+ADMIN = {"username": "benchadmin", "email": "bench@example.com", "password": "BenchPass123"}
+
+# name -> (method, path template, admin only); {component} and {category} are filled per request
+SCENARIOS = {
+    "categories": ("GET", "/api/categories", False),
+    "category_counts": ("GET", "/api/categories?include_counts=true", False),
+    "components_page": ("GET", "/api/components?limit=50&skip={offset}", False),
+    "category_page": ("GET", "/api/categories/{category}/components?limit=50", False),
+    "component_detail": ("GET", "/api/components/{component}", False),
+    "component_summary": ("GET", "/api/components/{component}?fields=summary", False),
+    "search": ("GET", "/api/search?q={term}&limit=20", False),
+    "admin_list": ("GET", "/api/admin/components?limit=50", True),
+    "admin_detail": ("GET", "/api/admin/components/{component}", True),
+    "admin_update": ("PUT", "/api/admin/components/{component}", True),
+}
+
+CATEGORIES = ["frontend", "backend", "database", "devops"]
+SEARCH_TERMS = ["kafka", "session", "cache", "deploy", "webhook"]
+
+# A run regresses when throughput falls or p95 rises by more than this fraction
+DEFAULT_TOLERANCE = 0.15
+
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def build_request(scenario: str, rng: random.Random, component_count: int):
+    method, template, _ = SCENARIOS[scenario]
+    path = template.format(
+        component=rng.randint(1, component_count),
+        category=rng.choice(CATEGORIES),
+        offset=rng.randint(0, max(0, component_count - 50)),
+        term=rng.choice(SEARCH_TERMS),
+    )
+    body = None
+    if method == "PUT":
+        body = {"title": f"Benchmark update {rng.randint(0, 1_000_000)}"}
+    return method, path, body
+
+
+async def login(client: httpx.AsyncClient) -> dict:
+    await client.post("/api/auth/signup", json=ADMIN)
+    response = await client.post(
+        "/api/auth/login",
+        data={"username": ADMIN["username"], "password": ADMIN["password"]}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def drive(client, scenario: str, concurrency: int, duration: float, component_count: int, auth: dict) -> dict:
+    latencies = []
+    errors = 0
+    headers = auth if SCENARIOS[scenario][2] else {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        nonlocal errors
+        rng = random.Random(worker_id)
+        while time.perf_counter() < deadline:
+            method, path, body = build_request(scenario, rng, component_count)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def run_in_process(args, scenarios: list, component_count: int) -> list:
+    from sqlalchemy import event
+    from database import async_engine
+    import main as app_module
+
+    statements = 0
+
+    def count_statement(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    results = []
+    transport = httpx.ASGITransport(app=app_module.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            auth = await login(client)
+            for scenario in scenarios:
+                for level in args.levels:
+                    statements = 0
+                    result = await drive(client, scenario, level, args.duration, component_count, auth)
+                    result["queries_per_request"] = statements / result["requests"] if result["requests"] else 0.0
+                    results.append({"mode": "in_process", **result})
+                    report(results[-1])
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+        await async_engine.dispose()
+    return results
+
+
+async def run_uvicorn(args, scenarios: list, component_count: int, env: dict) -> list:
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    results = []
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url)
+        for scenario in scenarios:
+            for level in args.levels:
+                limits = httpx.Limits(max_connections=level)
+                async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                    auth = await login(client)
+                    result = await drive(client, scenario, level, args.duration, component_count, auth)
+                # SQL is only observable in-process; see the in_process row for this scenario
+                result["queries_per_request"] = None
+                results.append({"mode": "uvicorn", **result})
+                report(results[-1])
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+
+def report(result: dict):
+    queries = result["queries_per_request"]
+    print(
+        f"{result['mode']:10} {result['scenario']:18} c={result['concurrency']:<3} "
+        f"{result['throughput_rps']:8.1f} req/s  p50 {result['p50_ms']:7.2f}  "
+        f"p95 {result['p95_ms']:7.2f}  p99 {result['p99_ms']:7.2f} ms  "
+        f"q/req {'-' if queries is None else f'{queries:.2f}'}  errors {result['errors']}",
+        file=sys.stderr
+    )
+
+
+def result_key(result: dict) -> tuple:
+    return result["mode"], result["scenario"], result["concurrency"]
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Regressions of this run against a baseline, matched by mode, scenario and concurrency"""
+    previous = {result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        name = "/".join(str(part) for part in result_key(result))
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s"
+            )
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if (
+            result["queries_per_request"] is not None
+            and before.get("queries_per_request") is not None
+            and result["queries_per_request"] > before["queries_per_request"] + 0.01
+        ):
+            regressions.append(
+                f"{name}: queries/request {before['queries_per_request']:.2f} -> {result['queries_per_request']:.2f}"
+            )
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["in_process", "uvicorn", "both"], default="in_process")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--snippets", type=int, default=5000)
+    parser.add_argument("--per-component", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    component_count = max(1, args.snippets // args.per_component)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        env = dict(os.environ, FOUNDRY_DATABASE_URL=url)
+        if not args.cache:
+            env["FOUNDRY_CACHE_MAX_ENTRIES"] = "0"
+        # The app reads its settings at import time, so configure this process first
+        os.environ.update(env)
+
+        from sqlalchemy import create_engine
+        from benchmarks.synthetic import seed
+        from model import Base
+
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.snippets, args.per_component, seed_value=args.seed)
+        engine.dispose()
+
+        results = []
+        if args.mode in ("in_process", "both"):
+            results += asyncio.run(run_in_process(args, args.scenarios, component_count))
+        if args.mode in ("uvicorn", "both"):
+            results += asyncio.run(run_uvicorn(args, args.scenarios, component_count, env))
+
+    document = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "cpu_count": os.cpu_count(),
+            "snippets": args.snippets,
+            "per_component": args.per_component,
+            "duration_s": args.duration,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        document["regressions"] = compare(results, baseline["results"], args.tolerance)
+
+    encoded = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if document.get("regressions"):
+        print("\n".join(["Regressions against baseline:"] + document["regressions"]), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
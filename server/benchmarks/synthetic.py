@@ -0,0 +1,101 @@
+"""Synthetic catalog generation shared by the benchmarks"""
+import itertools
+import random
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from model import Category, CategoryType, Component, CodeSnippet, SnippetBlob
+from snippets import snippet_metadata
+
+WORDS = [
+    "async", "buffer", "cache", "client", "config", "context", "cursor", "deploy",
+    "docker", "engine", "event", "fetch", "handler", "hook", "index", "kafka",
+    "layout", "logger", "metric", "module", "observer", "parser", "pipeline", "pool",
+    "query", "queue", "reducer", "router", "schema", "session", "socket", "stream",
+    "terraform", "token", "upload", "validator", "webhook", "worker", "yaml", "zod",
+]
+LANGUAGES = ["python", "typescript", "tsx", "yaml", "sql", "dockerfile", "hcl", "go"]
+
+# Identifiers in real code follow a Zipf-like distribution: a few keywords are
+# everywhere, most names are rare. Compose a vocabulary of camelCase names from
+# WORDS and weight it by 1/rank so searches see realistic selectivity.
+VOCABULARY = WORDS + [a + b.title() for a in WORDS for b in WORDS if a != b]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def synthetic_code(rng: random.Random, lines: int) -> str:
+    return "\n".join(
+        " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=rng.randint(3, 10)))
+        for _ in range(lines)
+    )
+
+
+# Files copied verbatim across many components in real catalogs
+BOILERPLATE = {
+    "Dockerfile": ("dockerfile", "FROM python:3.11-slim\nWORKDIR /app\nCOPY requirements.txt .\n"
+                   "RUN pip install --no-cache-dir -r requirements.txt\nCOPY . .\n"
+                   "CMD [\"uvicorn\", \"main:app\", \"--host\", \"0.0.0.0\"]\n"),
+    "tsconfig.json": ("json", "{\n  \"compilerOptions\": {\n    \"target\": \"ES2020\",\n"
+                      "    \"module\": \"ESNext\",\n    \"strict\": true,\n    \"jsx\": \"react-jsx\",\n"
+                      "    \"moduleResolution\": \"bundler\",\n    \"skipLibCheck\": true\n  }\n}\n"),
+    "ci.yml": ("yaml", "name: CI\non: [push, pull_request]\njobs:\n  test:\n    runs-on: ubuntu-latest\n"
+               "    steps:\n      - uses: actions/checkout@v4\n      - uses: actions/setup-python@v5\n"
+               "        with:\n          python-version: '3.11'\n      - run: pip install -r requirements.txt\n"
+               "      - run: pytest -q\n"),
+}
+
+
+def seed(engine, snippets: int, snippets_per_component: int, seed_value: int, boilerplate_fraction: float = 0.0):
+    """Insert a synthetic catalog; boilerplate_fraction of snippets reuse a shared config file"""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    components = max(1, snippets // snippets_per_component)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"id": i + 1, "name": c} for i, c in enumerate(CategoryType)])
+        conn.execute(insert(Component), [
+            {
+                "id": i + 1,
+                "title": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}",
+                "use_case": synthetic_code(rng, 2),
+                "category_id": rng.randint(1, len(CategoryType)),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(components)
+        ])
+        blobs = {}
+        rows = []
+        for i in range(snippets):
+            # Only draw for boilerplate when asked, so default catalogs match earlier runs
+            if boilerplate_fraction and rng.random() < boilerplate_fraction:
+                filename, (language, code) = rng.choice(list(BOILERPLATE.items()))
+            else:
+                code = synthetic_code(rng, rng.randint(5, 40))
+                filename = f"{rng.choice(WORDS)}_{i}.{rng.choice(['py', 'ts', 'yaml'])}"
+                language = rng.choice(LANGUAGES)
+            metadata = snippet_metadata(code)
+            rows.append({
+                "id": i + 1,
+                "filename": filename,
+                "language": language,
+                "component_id": i % components + 1,
+                "created_at": now,
+                **metadata,
+            })
+            blob = blobs.setdefault(metadata["content_hash"], {
+                "content_hash": metadata["content_hash"],
+                "code": code,
+                "byte_size": metadata["byte_size"],
+                "ref_count": 0,
+                "created_at": now,
+            })
+            blob["ref_count"] += 1
+
+        # Blobs first so every snippet's content_hash resolves
+        blob_rows = list(blobs.values())
+        for start in range(0, len(blob_rows), 5000):
+            conn.execute(insert(SnippetBlob), blob_rows[start:start + 5000])
+        for start in range(0, len(rows), 5000):
+            conn.execute(insert(CodeSnippet), rows[start:start + 5000])
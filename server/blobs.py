@@ -0,0 +1,126 @@
+import os
+from collections import Counter
+from typing import Iterable, List
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from cache import TTLCache
+from model import CodeSnippet, SnippetBlob, SnippetHighlight
+from snippets import snippet_metadata
+
+# Encoded snippet bodies keyed by content hash. A hash always names the same
+# bytes, so entries never go stale; the long TTL only ages out idle bodies.
+BLOB_CACHE_ENTRIES = int(os.environ.get('FOUNDRY_BLOB_CACHE_ENTRIES', '512'))
+BLOB_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+async def store_blobs(db, codes: List[str]) -> List[dict]:
+    """Add a reference to the blob of each body, inserting unseen bodies, and return their snippet metadata"""
+    metadata = [snippet_metadata(code) for code in codes]
+    if not metadata:
+        return metadata
+
+    bodies = {}
+    for code, meta in zip(codes, metadata):
+        bodies.setdefault(meta["content_hash"], (code, meta["byte_size"]))
+    counts = Counter(meta["content_hash"] for meta in metadata)
+    rows = [
+        {"content_hash": content_hash, "code": code, "byte_size": byte_size, "ref_count": counts[content_hash]}
+        for content_hash, (code, byte_size) in bodies.items()
+    ]
+
+    dialect_insert = UPSERT_INSERTS.get(db.bind.dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(SnippetBlob)
+        statement = statement.on_conflict_do_update(
+            index_elements=[SnippetBlob.content_hash],
+            set_={"ref_count": SnippetBlob.ref_count + statement.excluded.ref_count}
+        )
+        await db.execute(statement, rows)
+    else:
+        for row in rows:
+            result = await db.execute(
+                update(SnippetBlob)
+                .where(SnippetBlob.content_hash == row["content_hash"])
+                .values(ref_count=SnippetBlob.ref_count + row["ref_count"])
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                await db.execute(insert(SnippetBlob), [row])
+    return metadata
+
+
+async def store_blob(db, code: str) -> dict:
+    return (await store_blobs(db, [code]))[0]
+
+
+async def release_blobs(db, content_hashes: Iterable[str]):
+    """Drop one reference per hash, deleting blobs no snippet uses any more"""
+    # Callers flush their snippet deletes first, so no row still points at a deleted blob
+    counts = Counter(h for h in content_hashes if h)
+    if not counts:
+        return
+
+    by_count = {}
+    for content_hash, count in counts.items():
+        by_count.setdefault(count, []).append(content_hash)
+    for count, hashes in by_count.items():
+        await db.execute(
+            update(SnippetBlob)
+            .where(SnippetBlob.content_hash.in_(hashes))
+            .values(ref_count=SnippetBlob.ref_count - count)
+            .execution_options(synchronize_session=False)
+        )
+    unreferenced = select(SnippetBlob.content_hash).where(
+        SnippetBlob.content_hash.in_(list(counts)), SnippetBlob.ref_count <= 0
+    )
+    await db.execute(
+        delete(SnippetHighlight)
+        .where(SnippetHighlight.content_hash.in_(unreferenced))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        delete(SnippetBlob)
+        .where(SnippetBlob.content_hash.in_(list(counts)), SnippetBlob.ref_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def blob_bytes(db, content_hash: str) -> bytes:
+    """UTF-8 body for a content hash, served from blob_cache when possible"""
+    body = blob_cache.get(content_hash)
+    if body is None:
+        code = (
+            await db.execute(select(SnippetBlob.code).where(SnippetBlob.content_hash == content_hash))
+        ).scalar_one()
+        body = code.encode("utf-8")
+        blob_cache.set(content_hash, body)
+    return body
+
+
+def storage_report(conn) -> dict:
+    """Bytes the catalog's snippets would take stored per row versus deduplicated"""
+    snippets, logical_bytes = conn.execute(
+        select(func.count(CodeSnippet.id), func.coalesce(func.sum(CodeSnippet.byte_size), 0))
+    ).one()
+    blobs, stored_bytes = conn.execute(
+        select(func.count(SnippetBlob.content_hash), func.coalesce(func.sum(SnippetBlob.byte_size), 0))
+    ).one()
+    return {
+        "snippets": snippets,
+        "blobs": blobs,
+        "logical_bytes": logical_bytes,
+        "stored_bytes": stored_bytes,
+        "saved_bytes": logical_bytes - stored_bytes,
+        "dedup_ratio": logical_bytes / stored_bytes if stored_bytes else 1.0
+    }
+
+
+blob_cache = TTLCache(BLOB_CACHE_ENTRIES, BLOB_CACHE_TTL_SECONDS)
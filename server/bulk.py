@@ -0,0 +1,177 @@
+import json
+import os
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
+
+from model import Component, CodeSnippet
+from blobs import store_blobs
+from versioning import bump_catalog_version
+import schemas
+
+# Rows per transaction on import and per query on export
+IMPORT_BATCH_SIZE = int(os.environ.get('FOUNDRY_IMPORT_BATCH_SIZE', '500'))
+EXPORT_BATCH_SIZE = int(os.environ.get('FOUNDRY_EXPORT_BATCH_SIZE', '200'))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Render a pydantic error the same way the API's 422 handler does"""
+    errors = []
+    for error in exc.errors():
+        field = ".".join(str(x) for x in error["loc"])
+        errors.append(f"{field}: {error['msg']}" if field else error["msg"])
+    return "; ".join(errors)
+
+
+async def numbered_lines(chunks: AsyncIterator[bytes]):
+    """Split a streamed body into (line number, line) pairs without buffering it whole"""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+    if buffer:
+        yield line_number + 1, buffer
+
+
+def parse_row(line: bytes):
+    """Decode and validate one NDJSON row, returning (row, error)"""
+    try:
+        data = json.loads(line)
+    except ValueError as exc:
+        return None, f"Invalid JSON: {exc}"
+    try:
+        return schemas.ComponentImport.model_validate(data), None
+    except ValidationError as exc:
+        return None, format_validation_error(exc)
+
+
+async def insert_batch(db, batch, category_ids: dict):
+    """Insert a batch of validated rows in one transaction, returning the snippet count"""
+    # SQLite assigns ids in VALUES order, so sorting them recovers the row order
+    # without the one-INSERT-per-row fallback sort_by_parameter_order costs there;
+    # elsewhere (PostgreSQL) SQLAlchemy must match the returned ids to the rows
+    sqlite = db.bind.dialect.name == "sqlite"
+    result = await db.execute(
+        insert(Component).returning(Component.id, sort_by_parameter_order=not sqlite),
+        [
+            {
+                "title": row.title,
+                "use_case": row.use_case,
+                "category_id": category_ids[row.category]
+            }
+            for _, row in batch
+        ]
+    )
+    component_ids = result.scalars().all()
+    if sqlite:
+        component_ids = sorted(component_ids)
+    snippets = [
+        (component_id, snippet)
+        for component_id, (_, row) in zip(component_ids, batch)
+        for snippet in row.snippets
+    ]
+    # Repeated bodies within and across batches share one blob row
+    metadata = await store_blobs(db, [snippet.code for _, snippet in snippets])
+    snippet_rows = [
+        {
+            "component_id": component_id,
+            "filename": snippet.filename,
+            "language": snippet.language,
+            **meta
+        }
+        for (component_id, snippet), meta in zip(snippets, metadata)
+    ]
+    if snippet_rows:
+        await db.execute(insert(CodeSnippet), snippet_rows)
+    await bump_catalog_version(db)
+    await db.commit()
+    return len(snippet_rows)
+
+
+async def import_components(db, lines, category_ids: dict, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """Load NDJSON component rows (with nested snippets) in batched transactions"""
+    components = 0
+    snippets = 0
+    errors = []
+    categories = set()
+    batch = []
+    
+    async def flush():
+        nonlocal components, snippets
+        try:
+            snippets += await insert_batch(db, batch, category_ids)
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            message = f"Batch rejected by the database: {exc.__class__.__name__}"
+            errors.extend({"line": line_number, "error": message} for line_number, _ in batch)
+        else:
+            components += len(batch)
+            categories.update(row.category for _, row in batch)
+        batch.clear()
+    
+    async for line_number, line in lines:
+        if not line.strip():
+            continue
+        row, error = parse_row(line)
+        if error:
+            errors.append({"line": line_number, "error": error})
+            continue
+        batch.append((line_number, row))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    
+    return {
+        "components": components,
+        "snippets": snippets,
+        "errors": errors,
+        "categories": categories
+    }
+
+
+async def export_components(session_factory, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield every component with its snippets as NDJSON, one id-ordered batch at a time"""
+    last_id = 0
+    async with session_factory() as db:
+        while True:
+            components = (
+                await db.execute(
+                    select(Component)
+                    .options(joinedload(Component.category), selectinload(Component.snippets))
+                    .where(Component.id > last_id)
+                    .order_by(Component.id)
+                    .limit(batch_size)
+                )
+            ).scalars().all()
+            if not components:
+                return
+            
+            lines = []
+            for component in components:
+                row = schemas.ComponentWithSnippetsResponse(
+                    id=component.id,
+                    title=component.title,
+                    use_case=component.use_case,
+                    category=component.category.name.name,
+                    snippets=[
+                        schemas.CodeSnippetResponse.model_validate(s) for s in component.snippets
+                    ],
+                    created_at=component.created_at,
+                    updated_at=component.updated_at
+                )
+                lines.append(row.model_dump_json() + "\n")
+            yield "".join(lines).encode()
+            
+            last_id = components[-1].id
+            # Drop the batch from the identity map so memory stays flat
+            db.expunge_all()
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Response cache settings, overridable per deployment
+CACHE_MAX_ENTRIES = int(os.environ.get('FOUNDRY_CACHE_MAX_ENTRIES', '1024'))
+CACHE_TTL_SECONDS = float(os.environ.get('FOUNDRY_CACHE_TTL_SECONDS', '60'))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds: Optional[float] = None):
+        """Store a value, optionally overriding the cache-wide TTL for this entry"""
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    # Callers must hold self._lock
+    def _store(self, key, value, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (self._clock() + ttl_seconds, value)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+
+
+class ResponseCache(TTLCache):
+    """TTL cache whose entries carry tags so writes can invalidate exactly the affected keys"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic):
+        super().__init__(max_entries, ttl_seconds, clock)
+        self._tags = {}
+        self._keys_by_tag = {}
+        # Advanced by every invalidation, so readers can tell a write landed while they queried
+        self.generation = 0
+        self.stale_writes = 0
+
+    def set(self, key, value, tags=(), generation: Optional[int] = None):
+        """Store a value unless the cache was invalidated after `generation` was read"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_writes += 1
+                return
+            self._remove(key)
+            self._store(key, value)
+            self._tags[key] = tuple(tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of the given tags"""
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, set()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats["stale_writes"] = self.stale_writes
+        return stats
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        for tag in self._tags.pop(key, ()):
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+# Tags shared by the public read paths and the admin write paths
+CATEGORIES_TAG = "categories"
+COMPONENT_LIST_TAG = "components"
+
+
+def component_tag(component_id: int) -> str:
+    return f"component:{component_id}"
+
+
+def category_tag(category_name: str) -> str:
+    return f"category:{category_name}"
+
+
+response_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from sqlalchemy import insert, select
+
+from model import Category, CategoryType
+
+
+@dataclass(frozen=True)
+class CategoryRef:
+    """A seeded category row, resolvable without touching the database"""
+    id: int
+    type: CategoryType
+
+    @property
+    def key(self) -> str:
+        return self.type.name
+
+    @property
+    def display_name(self) -> str:
+        return self.type.value
+
+
+# Filled once by load_categories at startup; read-only afterwards
+_by_key: Mapping[str, CategoryRef] = MappingProxyType({})
+_by_id: Mapping[int, CategoryRef] = MappingProxyType({})
+
+
+def seed_categories(engine):
+    """Insert any missing CategoryType rows, then load the process-wide map"""
+    with engine.begin() as conn:
+        existing = set(conn.execute(select(Category.name)).scalars())
+        missing = [{"name": c} for c in CategoryType if c not in existing]
+        if missing:
+            conn.execute(insert(Category), missing)
+    load_categories(engine)
+
+
+def load_categories(engine):
+    global _by_key, _by_id
+    with engine.connect() as conn:
+        rows = conn.execute(select(Category.id, Category.name)).all()
+    refs = [CategoryRef(id=row.id, type=row.name) for row in rows]
+    _by_key = MappingProxyType({ref.key: ref for ref in refs})
+    _by_id = MappingProxyType({ref.id: ref for ref in refs})
+
+
+def resolve_category(name: str) -> Optional[CategoryRef]:
+    """Look up a category by its API name (e.g. "frontend"), case-insensitively"""
+    return _by_key.get(name.lower())
+
+
+def category_by_id(category_id: int) -> Optional[CategoryRef]:
+    return _by_id.get(category_id)
+
+
+def category_ids() -> Mapping[str, int]:
+    return MappingProxyType({key: ref.id for key, ref in _by_key.items()})
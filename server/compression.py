@@ -0,0 +1,231 @@
+import gzip
+import os
+import threading
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from cache import TTLCache, CACHE_TTL_SECONDS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip-only when Brotli is not installed
+    brotli = None
+
+# Responses smaller than this are sent as-is; compression costs more than it saves
+COMPRESSION_MIN_SIZE = int(os.environ.get('FOUNDRY_COMPRESSION_MIN_SIZE', '500'))
+GZIP_LEVEL = int(os.environ.get('FOUNDRY_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('FOUNDRY_BROTLI_QUALITY', '4'))
+# Compressed bodies of ETagged responses, keyed by (ETag, encoding)
+COMPRESSION_CACHE_ENTRIES = int(os.environ.get('FOUNDRY_COMPRESSION_CACHE_ENTRIES', '256'))
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+)
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple) -> Optional[str]:
+    """Pick the first available encoding the client accepts with a non-zero q-value"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streamed rows arrive promptly"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def process(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating br/gzip, reusing compressed bodies for unchanged ETags"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+        cache: Optional[TTLCache] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache if cache is not None else compressed_cache
+        self.stats = compression_stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), available_encodings())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-request send wrapper: buffers single-message bodies, streams the rest"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or "content-range" in headers
+                or message["status"] < 200
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None and self.start_message is not None and not more_body:
+            await self.send_whole(body)
+            return
+
+        # Streamed bodies can't be sized up front, so they are always compressed
+        if self.compressor is None:
+            self.compressor = StreamCompressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+            self.start_message = None
+
+        compressed = self.compressor.process(body) if body else b""
+        if not more_body:
+            compressed += self.compressor.finish()
+        self.middleware.stats.record(len(body), len(compressed), finished=not more_body)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    async def send_whole(self, body: bytes):
+        message = self.start_message
+        self.start_message = None
+        headers = MutableHeaders(raw=message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if len(body) < self.middleware.minimum_size:
+            await self._send(message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        etag = headers.get("etag")
+        cache_key = (etag, self.encoding) if etag else None
+        compressed = self.middleware.cache.get(cache_key) if cache_key else None
+        cached = compressed is not None
+        if not cached:
+            compressed = compress(body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if cache_key:
+                self.middleware.cache.set(cache_key, compressed)
+        self.middleware.stats.record(len(body), len(compressed), cached=cached)
+
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+
+class CompressionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.cached_responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, bytes_in: int, bytes_out: int, cached: bool = False, finished: bool = True):
+        with self._lock:
+            self.responses += int(finished)
+            self.cached_responses += int(cached)
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "encodings": list(available_encodings()),
+                "responses": self.responses,
+                "served_from_cache": self.cached_responses,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+                "cache": compressed_cache.stats()
+            }
+
+
+compressed_cache = TTLCache(COMPRESSION_CACHE_ENTRIES, CACHE_TTL_SECONDS)
+compression_stats = CompressionStats()
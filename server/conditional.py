@@ -0,0 +1,82 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from starlette import status
+
+
+@dataclass(frozen=True)
+class Validators:
+    """HTTP cache validators for a single representation"""
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def headers(self) -> dict:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "no-cache"
+        }
+        if self.last_modified is not None:
+            headers["Last-Modified"] = http_date(self.last_modified)
+        return headers
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from ids and timestamps identifying a representation"""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def latest(*values) -> Optional[datetime]:
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def has_conditional_headers(request: Request) -> bool:
+    """Whether the request carries validators worth checking before loading the representation"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110 13.2.2)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in candidates:
+            return True
+        # If-None-Match uses the weak comparison function
+        return any(tag.removeprefix("W/") == validators.etag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    last_modified = validators.last_modified
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates only carry whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(validators: Validators) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers())
+
+
+def apply_validators(response: Response, validators: Validators):
+    response.headers.update(validators.headers())
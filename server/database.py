@@ -1,22 +1,165 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+from pooling import PoolMetrics, instrumented_pool_class
 
 # Use test DB if set, else default
 SQLALCHEMY_DATABASE_URL = os.environ.get('FOUNDRY_DATABASE_URL', 'sqlite:///./Foundry.db')
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={'check_same_thread': False}
-)
+# SQLite connection tuning; set any of these to an empty string to keep SQLite's default
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('FOUNDRY_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('FOUNDRY_SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': os.environ.get('FOUNDRY_SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'cache_size': os.environ.get('FOUNDRY_SQLITE_CACHE_SIZE', '-20000'),
+    'mmap_size': os.environ.get('FOUNDRY_SQLITE_MMAP_SIZE', '268435456'),
+    'temp_store': os.environ.get('FOUNDRY_SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
+# Connection pool settings; sizing only applies to queue-based pools
+POOL_SIZE = int(os.environ.get('FOUNDRY_DB_POOL_SIZE', '5'))
+POOL_MAX_OVERFLOW = int(os.environ.get('FOUNDRY_DB_MAX_OVERFLOW', '10'))
+POOL_TIMEOUT_SECONDS = float(os.environ.get('FOUNDRY_DB_POOL_TIMEOUT_SECONDS', '30'))
+POOL_RECYCLE_SECONDS = int(os.environ.get('FOUNDRY_DB_POOL_RECYCLE_SECONDS', '1800'))
+# Unset means ping before checkout on network databases only
+POOL_PRE_PING = os.environ.get('FOUNDRY_DB_POOL_PRE_PING', '').lower()
+# Server-side statement timeout in milliseconds, 0 disables it (ignored on SQLite)
+STATEMENT_TIMEOUT_MS = int(os.environ.get('FOUNDRY_DB_STATEMENT_TIMEOUT_MS', '0'))
+
+# PRAGMA values cannot be bound as parameters, so only these are accepted
+SQLITE_PRAGMA_CHOICES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+}
+
+# asyncio drivers used by the request path for each sync driver URL
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto the matching asyncio driver"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def sqlite_pragma_statements(pragmas: dict) -> list:
+    """Validate pragma settings and render them as PRAGMA statements"""
+    statements = []
+    for name, value in pragmas.items():
+        if value is None or str(value).strip() == '':
+            continue
+        value = str(value).strip().upper()
+        choices = SQLITE_PRAGMA_CHOICES.get(name)
+        if choices is not None:
+            if value not in choices:
+                raise ValueError(f"Invalid SQLite {name}: {value}")
+        else:
+            try:
+                value = str(int(value))
+            except ValueError:
+                raise ValueError(f"Invalid SQLite {name}: {value}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def install_sqlite_pragmas(target_engine, pragmas: dict = SQLITE_PRAGMAS):
+    """Apply the pragmas to every new DBAPI connection of a SQLite engine"""
+    if target_engine.dialect.name != 'sqlite':
+        return
+    statements = sqlite_pragma_statements(pragmas)
+    
+    @event.listens_for(target_engine, 'connect')
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def engine_options(url: str, metrics: PoolMetrics = None) -> dict:
+    """Keyword arguments for create_engine/create_async_engine suited to the URL's dialect"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = parsed.get_driver_name()
+    pool_class = parsed.get_dialect().get_pool_class(parsed)
+    if POOL_PRE_PING:
+        pre_ping = POOL_PRE_PING in ('1', 'true', 'yes')
+    else:
+        pre_ping = backend != 'sqlite'
+    options = {
+        'pool_pre_ping': pre_ping,
+        'pool_recycle': POOL_RECYCLE_SECONDS,
+    }
+    if issubclass(pool_class, QueuePool):
+        options.update({
+            'pool_size': POOL_SIZE,
+            'max_overflow': POOL_MAX_OVERFLOW,
+            'pool_timeout': POOL_TIMEOUT_SECONDS,
+        })
+    if metrics is not None:
+        options['poolclass'] = instrumented_pool_class(pool_class, metrics)
+    
+    connect_args = {}
+    if backend == 'sqlite':
+        connect_args['check_same_thread'] = False
+    elif backend == 'postgresql' and STATEMENT_TIMEOUT_MS:
+        if driver == 'asyncpg':
+            connect_args['server_settings'] = {'statement_timeout': str(STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args['options'] = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+    elif backend == 'mysql' and STATEMENT_TIMEOUT_MS:
+        connect_args['init_command'] = f"SET SESSION max_execution_time={STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
+def create_database_engine(url: str, metrics: PoolMetrics = None):
+    """Build a sync engine with pool and dialect settings taken from the environment"""
+    database_engine = create_engine(url, **engine_options(url, metrics))
+    install_sqlite_pragmas(database_engine)
+    return database_engine
+
+
+def create_async_database_engine(url: str, metrics: PoolMetrics = None):
+    """Build an async engine for the asyncio driver matching a sync URL"""
+    async_url = async_database_url(url)
+    database_engine = create_async_engine(async_url, **engine_options(async_url, metrics))
+    install_sqlite_pragmas(database_engine.sync_engine)
+    return database_engine
+
+
+# Checkout wait times for each engine's pool, reported by /api/admin/stats
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+# Sync engine for startup tasks, CLI tools and benchmarks
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL, pool_metrics)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by every request handler
+async_engine = create_async_database_engine(SQLALCHEMY_DATABASE_URL, async_pool_metrics)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
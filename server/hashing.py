@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# bcrypt runs on a small dedicated pool; calls beyond the pending limit are shed
+HASH_WORKERS = int(os.environ.get('FOUNDRY_HASH_WORKERS', '2'))
+HASH_MAX_PENDING = int(os.environ.get('FOUNDRY_HASH_MAX_PENDING', '16'))
+
+
+class HashQueueFull(Exception):
+    """Raised when too many password hash operations are already queued"""
+
+
+class PasswordHasher:
+    """Runs a passlib context's hash/verify off the event loop with bounded queueing"""
+
+    def __init__(self, context, workers: int, max_pending: int):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HashQueueFull()
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.completed += 1
+                    self.wait_seconds += started - submitted
+                    self.hash_seconds += finished - started
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the job finishes or is cancelled before starting, not when the
+        # caller stops waiting, since a cancelled request leaves a running job behind
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        with self._lock:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self.pending,
+                "max_queue_depth": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_total": self.wait_seconds,
+                "hash_seconds_total": self.hash_seconds,
+                "avg_wait_ms": self.wait_seconds / self.completed * 1000 if self.completed else 0.0,
+                "avg_hash_ms": self.hash_seconds / self.completed * 1000 if self.completed else 0.0
+            }
@@ -0,0 +1,152 @@
+"""Server-side syntax highlighting of snippet bodies with Pygments.
+
+HTML is rendered when snippets are written and stored per (content hash,
+language), so identical bodies share one rendition. Rows written before this
+existed, or by bulk import, are filled by the backfill command:
+
+    python highlighting.py backfill
+"""
+import functools
+import os
+import sys
+from typing import Iterable
+
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.lexers.special import TextLexer
+from pygments.util import ClassNotFound
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from starlette.concurrency import run_in_threadpool
+
+from model import CodeSnippet, SnippetBlob, SnippetHighlight
+
+# Bodies larger than this are escaped but not tokenized, to bound write latency
+HIGHLIGHT_MAX_BYTES = int(os.environ.get('FOUNDRY_HIGHLIGHT_MAX_BYTES', '262144'))
+BACKFILL_BATCH_SIZE = 200
+
+# Spans only; clients wrap them in their own <pre><code> and style Pygments' token classes
+FORMATTER = HtmlFormatter(nowrap=True)
+
+INSERT_IGNORE = {
+    'sqlite': lambda: sqlite.insert(SnippetHighlight).on_conflict_do_nothing(),
+    'postgresql': lambda: postgresql.insert(SnippetHighlight).on_conflict_do_nothing(),
+}
+
+
+def language_key(language: str) -> str:
+    return language.lower()
+
+
+@functools.lru_cache(maxsize=128)
+def lexer_for(language: str):
+    try:
+        return get_lexer_by_name(language_key(language))
+    except ClassNotFound:
+        return TextLexer()
+
+
+def highlight_html(code: str, language: str) -> str:
+    lexer = lexer_for(language)
+    if len(code.encode("utf-8")) > HIGHLIGHT_MAX_BYTES:
+        lexer = TextLexer()
+    return highlight(code, lexer, FORMATTER)
+
+
+def insert_statement(dialect_name: str):
+    make = INSERT_IGNORE.get(dialect_name)
+    return make() if make is not None else insert(SnippetHighlight)
+
+
+async def store_highlight(db, content_hash: str, code: str, language: str):
+    """Render a body for a language off the event loop and store it unless already present"""
+    key = language_key(language)
+    # Checked first on every dialect so a known pair is never rendered again;
+    # INSERT_IGNORE still covers a concurrent writer storing it in between
+    existing = (
+        await db.execute(
+            select(SnippetHighlight.content_hash)
+            .where(SnippetHighlight.content_hash == content_hash, SnippetHighlight.language == key)
+        )
+    ).first()
+    if existing is not None:
+        return
+    html = await run_in_threadpool(highlight_html, code, language)
+    await db.execute(
+        insert_statement(db.bind.dialect.name),
+        [{"content_hash": content_hash, "language": key, "html": html}]
+    )
+
+
+async def load_highlights(db, snippets: Iterable) -> dict:
+    """Stored HTML for each snippet keyed by snippet id, rendering any that are missing"""
+    snippets = list(snippets)
+    hashes = {s.content_hash for s in snippets}
+    rows = (
+        await db.execute(
+            select(SnippetHighlight.content_hash, SnippetHighlight.language, SnippetHighlight.html)
+            .where(SnippetHighlight.content_hash.in_(hashes))
+        )
+    ).all() if hashes else []
+    stored = {(row.content_hash, row.language): row.html for row in rows}
+
+    result = {}
+    for snippet in snippets:
+        html = stored.get((snippet.content_hash, language_key(snippet.language)))
+        if html is None:
+            # Not backfilled yet; render for this response without writing on a read path
+            html = await run_in_threadpool(highlight_html, snippet.code, snippet.language)
+        result[snippet.id] = html
+    return result
+
+
+def missing_highlights(conn, limit: int) -> list:
+    """(hash, language, code) for bodies in use in a language that has no stored HTML"""
+    pairs = (
+        select(CodeSnippet.content_hash, func.lower(CodeSnippet.language).label("language"))
+        .distinct()
+        .subquery()
+    )
+    stored = (
+        select(SnippetHighlight.content_hash)
+        .where(
+            SnippetHighlight.content_hash == pairs.c.content_hash,
+            SnippetHighlight.language == pairs.c.language
+        )
+        .exists()
+    )
+    return conn.execute(
+        select(pairs.c.content_hash, pairs.c.language, SnippetBlob.code)
+        .join(SnippetBlob, SnippetBlob.content_hash == pairs.c.content_hash)
+        .where(~stored)
+        .limit(limit)
+    ).all()
+
+
+def backfill(engine, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Render and store HTML for every body/language pair that lacks it, returning the count"""
+    statement = insert_statement(engine.dialect.name)
+    rendered = 0
+    while True:
+        with engine.begin() as conn:
+            rows = missing_highlights(conn, batch_size)
+            if not rows:
+                return rendered
+            conn.execute(statement, [
+                {
+                    "content_hash": row.content_hash,
+                    "language": row.language,
+                    "html": highlight_html(row.code, row.language)
+                }
+                for row in rows
+            ])
+        rendered += len(rows)
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    if sys.argv[1:] != ["backfill"]:
+        sys.exit("usage: python highlighting.py backfill")
+    print(f"rendered {backfill(engine)} snippet highlights")
@@ -1,17 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from routers import auth, admin, public
-from database import engine, SessionLocal
-import model
+from database import engine, async_engine
+from search import ensure_search_index
+from categories import seed_categories
+from migrations import migrate
+from compression import CompressionMiddleware
+from cache import response_cache
+from database import pool_metrics, async_pool_metrics
+import metrics
+from profiling import ProfilingMiddleware, slow_query_log
+from versioning import CatalogVersionMiddleware, CATALOG_VERSION_HEADER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled async connections so their driver threads exit
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Foundry Backend",
     description="Enterprise Development & Deployment Starter Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Compress JSON and code payloads for clients that accept br/gzip
+app.add_middleware(CompressionMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -26,8 +47,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor", CATALOG_VERSION_HEADER],
 )
 
+# Tell public API clients which catalog version a response reflects
+app.add_middleware(CatalogVersionMiddleware, connect=async_engine.connect)
+
+# Attribute slow queries to routes and run admin requests under cProfile on demand
+app.add_middleware(ProfilingMiddleware, authorize=auth.is_admin_token)
+
+# Outermost, so request latency includes compression and CORS handling
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Time every request-path SQL statement, logging slow ones, and report pool, hashing and cache figures on scrape
+metrics.instrument_engine(async_engine.sync_engine, observers=[slow_query_log()])
+metrics.registry.add_collector(metrics.pool_collector({"requests": async_pool_metrics, "sync": pool_metrics}))
+metrics.registry.add_collector(metrics.hashing_collector(auth.password_hasher))
+metrics.registry.add_collector(metrics.cache_collector({
+    "responses": response_cache,
+    "tokens": auth.token_cache,
+    "admins": auth.admin_cache,
+}))
+
 # Custom validation error handler
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
@@ -44,8 +85,10 @@ async def validation_exception_handler(request, exc):
         }
     )
 
-# Create database tables
-model.Base.metadata.create_all(bind=engine)
+# Create or upgrade database tables
+migrate(engine)
+seed_categories(engine)
+ensure_search_index(engine)
 
 # Include routers
 app.include_router(auth.router)
@@ -68,4 +111,10 @@ def health_check():
     return {
         "status": "healthy",
         "message": "Foundry Backend is running"
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition of request, SQL, pool, cache and hashing metrics"""
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
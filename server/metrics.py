@@ -0,0 +1,314 @@
+"""Prometheus text exposition for request, SQL, pool, cache and password hashing metrics.
+
+Only the standard library is used. Hot-path updates are a dict lookup plus a
+few additions under a lock; pool, cache and hashing figures are read from
+their own stats() at scrape time.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for API latencies from sub-millisecond cache hits to slow pages
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+QUERIES_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21, 50)
+
+# Label used for requests that matched no route, to keep cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, ([*s[0]], s[1], s[2])) for labels, s in self._series.items())
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{format_labels(names, labels + (format_value(float(bound)),))} {cumulative}"
+                )
+            suffix = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """Register a callable producing exposition lines at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def stat_lines(name: str, kind: str, documentation: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    """Exposition lines for a metric whose samples are read from elsewhere at scrape time"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(tuple(labels), tuple(labels.values()))} {format_value(value)}")
+    return lines
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "foundry_http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+))
+http_latency = registry.register(Histogram(
+    "foundry_http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+))
+http_in_flight = registry.register(Gauge(
+    "foundry_http_requests_in_flight", "HTTP requests currently being served"
+))
+db_queries = registry.register(Counter(
+    "foundry_db_queries_total", "SQL statements executed by the request engine"
+))
+db_query_latency = registry.register(Histogram(
+    "foundry_db_query_duration_seconds", "SQL statement execution time", buckets=QUERY_BUCKETS
+))
+db_queries_per_request = registry.register(Histogram(
+    "foundry_db_queries_per_request", "SQL statements issued while serving one request", ("route",),
+    buckets=QUERIES_PER_REQUEST_BUCKETS
+))
+db_time_per_request = registry.register(Histogram(
+    "foundry_db_time_per_request_seconds", "Time spent in SQL while serving one request", ("route",),
+    buckets=LATENCY_BUCKETS
+))
+
+# [statement count, seconds in SQL] for the request running in this context
+_request_queries: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_queries", default=None)
+
+
+def instrument_engine(sync_engine, observers: Iterable[Optional[Callable[[str, float], None]]] = ()):
+    """Time every statement on an engine and attribute it to the current request
+
+    Each observer is also called with the statement and its elapsed seconds, so
+    other per-statement checks share this timer rather than adding their own.
+    """
+    observers = [observer for observer in observers if observer is not None]
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        db_queries.inc()
+        db_query_latency.observe(elapsed)
+        totals = _request_queries.get()
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += elapsed
+        for observer in observers:
+            observer(statement, elapsed)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency, in-flight and SQL per request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        totals = [0, 0.0]
+        token = _request_queries.set(totals)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            _request_queries.reset(token)
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status_code))
+            http_latency.observe(elapsed, method, route)
+            db_queries_per_request.observe(totals[0], route)
+            db_time_per_request.observe(totals[1], route)
+
+
+def pool_collector(pools: dict) -> Callable[[], List[str]]:
+    """Scrape-time collector for PoolMetrics objects keyed by engine name"""
+
+    def collect() -> List[str]:
+        snapshots = {name: pool.stats() for name, pool in pools.items()}
+        lines = []
+        for name, kind, key, documentation in (
+            ("foundry_db_pool_checkouts_total", "counter", "checkouts", "Connections checked out of the pool"),
+            ("foundry_db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out waiting"),
+            ("foundry_db_pool_wait_seconds_total", "counter", "wait_seconds_total", "Time spent waiting for a connection"),
+            ("foundry_db_pool_checked_out", "gauge", "checked_out", "Connections currently checked out"),
+            ("foundry_db_pool_overflow", "gauge", "overflow", "Connections open beyond the pool size"),
+        ):
+            samples = [({"engine": engine}, stats[key]) for engine, stats in snapshots.items() if key in stats]
+            if samples:
+                lines += stat_lines(name, kind, documentation, samples)
+        return lines
+
+    return collect
+
+
+def hashing_collector(hasher) -> Callable[[], List[str]]:
+    """Scrape-time collector for a PasswordHasher"""
+
+    def collect() -> List[str]:
+        stats = hasher.stats()
+        return (
+            stat_lines("foundry_password_hash_seconds_total", "counter", "Time spent in bcrypt",
+                       [({}, stats["hash_seconds_total"])])
+            + stat_lines("foundry_password_hash_wait_seconds_total", "counter",
+                         "Time hash jobs waited for a worker", [({}, stats["wait_seconds_total"])])
+            + stat_lines("foundry_password_hashes_total", "counter", "Completed bcrypt hash/verify calls",
+                         [({}, stats["completed"])])
+            + stat_lines("foundry_password_hashes_rejected_total", "counter",
+                         "Hash calls shed because the queue was full", [({}, stats["rejected"])])
+            + stat_lines("foundry_password_hash_queue_depth", "gauge", "Hash calls queued or running",
+                         [({}, stats["queue_depth"])])
+        )
+
+    return collect
+
+
+def cache_collector(caches: dict) -> Callable[[], List[str]]:
+    """Scrape-time collector for TTLCache objects keyed by cache name"""
+
+    def collect() -> List[str]:
+        snapshots = {name: cache.stats() for name, cache in caches.items()}
+        lines = []
+        for name, kind, key, documentation in (
+            ("foundry_cache_hits_total", "counter", "hits", "Cache lookups that found a live entry"),
+            ("foundry_cache_misses_total", "counter", "misses", "Cache lookups that found nothing"),
+            ("foundry_cache_evictions_total", "counter", "evictions", "Entries evicted to stay within capacity"),
+            ("foundry_cache_entries", "gauge", "entries", "Entries currently cached"),
+        ):
+            lines += stat_lines(name, kind, documentation,
+                                [({"cache": cache}, stats[key]) for cache, stats in snapshots.items()])
+        return lines
+
+    return collect
@@ -0,0 +1,143 @@
+"""Versioned schema migrations, applied at startup or with `python migrations.py`.
+
+Each migration runs once, in its own transaction, and is tracked in the
+schema_migrations table. A fresh database gets today's tables from the
+initial migration, so later migrations must be no-ops against that schema.
+"""
+import sys
+from datetime import datetime
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Engine
+
+from model import Base, Component, CodeSnippet, SnippetBlob, SnippetHighlight, CatalogVersion
+from snippets import snippet_metadata
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def create_initial_schema(conn):
+    Base.metadata.create_all(bind=conn)
+
+
+def add_snippet_metadata(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("code_snippets")}
+    for name, ddl in (
+        ("byte_size", "INTEGER"),
+        ("line_count", "INTEGER"),
+        ("content_hash", "VARCHAR(64)"),
+    ):
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE code_snippets ADD COLUMN {name} {ddl}"))
+    if "code" not in columns:
+        # Created after snippet_blobs, which fills the metadata itself
+        return
+    
+    last_id = 0
+    while True:
+        # The code column has since moved to snippet_blobs, so it is named in SQL here
+        rows = conn.execute(
+            text(
+                "SELECT id, code FROM code_snippets WHERE id > :last_id AND content_hash IS NULL "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            conn.execute(
+                update(CodeSnippet).where(CodeSnippet.id == row.id).values(**snippet_metadata(row.code))
+            )
+        last_id = rows[-1].id
+
+
+def add_catalog_indexes(conn):
+    for table in (Component.__table__, CodeSnippet.__table__):
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def move_snippet_bodies(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("code_snippets")}
+    if "code" not in columns:
+        return
+    SnippetBlob.__table__.create(bind=conn, checkfirst=True)
+    
+    # The old FTS triggers read code_snippets.code; search.py recreates them over the blobs
+    if conn.dialect.name == "sqlite":
+        for trigger in ("code_snippets_fts_insert", "code_snippets_fts_delete", "code_snippets_fts_update"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text("DROP TABLE IF EXISTS snippet_fts"))
+    
+    conn.execute(text(
+        "INSERT INTO snippet_blobs (content_hash, code, byte_size, ref_count, created_at) "
+        "SELECT content_hash, MIN(code), MIN(byte_size), COUNT(*), MIN(created_at) "
+        "FROM code_snippets GROUP BY content_hash"
+    ))
+    conn.execute(text("ALTER TABLE code_snippets DROP COLUMN code"))
+
+
+def add_snippet_highlights(conn):
+    # Filled on snippet writes and by `python highlighting.py backfill`
+    SnippetHighlight.__table__.create(bind=conn, checkfirst=True)
+
+
+def add_catalog_version(conn):
+    CatalogVersion.__table__.create(bind=conn, checkfirst=True)
+    exists = conn.execute(text("SELECT 1 FROM catalog_version WHERE id = 1")).first()
+    if not exists:
+        conn.execute(
+            CatalogVersion.__table__.insert(),
+            {"id": 1, "version": 0, "updated_at": datetime.utcnow()}
+        )
+
+
+# (version, name, function) in the order they must be applied
+MIGRATIONS = [
+    (0, "initial_schema", create_initial_schema),
+    (1, "snippet_metadata", add_snippet_metadata),
+    (2, "catalog_indexes", add_catalog_indexes),
+    (3, "snippet_blobs", move_snippet_bodies),
+    (4, "snippet_highlights", add_snippet_highlights),
+    (5, "catalog_version", add_catalog_version),
+    (6, "category_listing_index", add_catalog_indexes),
+]
+
+
+def applied_versions(engine: Engine) -> set:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+        ))
+        return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def migrate(engine: Engine) -> list:
+    """Apply every pending migration, returning the names of those that ran"""
+    done = applied_versions(engine)
+    ran = []
+    for version, name, apply in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {"v": version, "n": name, "t": datetime.utcnow()}
+            )
+        ran.append(name)
+    return ran
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    if sys.argv[1:] == ["status"]:
+        done = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:3}  {name:20}  {'applied' if version in done else 'pending'}")
+    else:
+        for name in migrate(engine):
+            print(f"applied {name}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship, declarative_base
 import enum
 from datetime import datetime
@@ -35,6 +35,37 @@ class Component(Base):
     category = relationship("Category", back_populates="components")
     snippets = relationship("CodeSnippet", back_populates="component", cascade="all, delete-orphan")
 
+    # Created by migrations.py; the composites also serve plain category_id lookups
+    __table_args__ = (
+        Index("ix_components_category_id_created_at", "category_id", "created_at"),
+        # Category listings page by id within a category, so this walks them in order
+        Index("ix_components_category_id_id", "category_id", "id"),
+        Index("ix_components_created_at", "created_at"),
+        Index("ix_components_updated_at", "updated_at"),
+    )
+
+
+class SnippetBlob(Base):
+    __tablename__ = "snippet_blobs"
+
+    # Each distinct snippet body is stored once, keyed by its SHA-256
+    content_hash = Column(String(64), primary_key=True)
+    code = Column(Text, nullable=False)
+    byte_size = Column(Integer, nullable=False)
+    # Snippets pointing at this body; the row is deleted when it reaches zero
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SnippetHighlight(Base):
+    __tablename__ = "snippet_highlights"
+
+    # Pygments HTML for a body in one language, rendered when snippets are written
+    content_hash = Column(String(64), ForeignKey("snippet_blobs.content_hash"), primary_key=True)
+    language = Column(String(50), primary_key=True)
+    html = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 
 class CodeSnippet(Base):
     __tablename__ = "code_snippets"
@@ -42,11 +73,34 @@ class CodeSnippet(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
     language = Column(String(50), nullable=False)
-    code = Column(Text, nullable=False)
     component_id = Column(Integer, ForeignKey("components.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Derived from code on every write so listings never need to load it
+    byte_size = Column(Integer)
+    line_count = Column(Integer)
+    content_hash = Column(String(64), ForeignKey("snippet_blobs.content_hash"), nullable=False)
 
     component = relationship("Component", back_populates="snippets")
+    blob = relationship("SnippetBlob", lazy="joined", innerjoin=True)
+
+    @property
+    def code(self) -> str:
+        return self.blob.code
+
+    # Created by migrations.py; covers both component_id filters and per-component id order
+    __table_args__ = (
+        Index("ix_code_snippets_component_id_id", "component_id", "id"),
+        Index("ix_code_snippets_created_at", "created_at"),
+    )
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    # A single row whose counter every admin write increments in its own transaction
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
 
 class Admin(Base):
@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from typing import Annotated, Optional
+
+from fastapi import HTTPException, Path, Response
+from starlette import status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Ids outside SQLite's 64-bit INTEGER range cannot be bound as query parameters
+MIN_ID = -2 ** 63
+MAX_ID = 2 ** 63 - 1
+# Row id path parameter, answered with 422 instead of overflowing the driver when out of range
+id_path = Annotated[int, Path(ge=1, le=MAX_ID)]
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen id as an opaque, URL-safe cursor"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+    # bool is an int subclass, and an out-of-range id would overflow when bound
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or not MIN_ID <= last_id <= MAX_ID:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return last_id
+
+
+def paginate(query, id_column, skip: int, limit: int, cursor: Optional[str]):
+    """Order a query by id and apply keyset (cursor) or legacy offset pagination"""
+    query = query.order_by(id_column)
+    if cursor is not None:
+        return query.filter(id_column > decode_cursor(cursor)).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def next_cursor(items, limit: int) -> Optional[str]:
+    """Cursor for the page after `items`, or None when this was the last page"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1]["id"])
+
+
+def apply_next_cursor(response: Response, items, limit: int):
+    cursor = next_cursor(items, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Counts pool checkouts and how long callers waited for a connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "pool": type(self.pool).__mro__[1].__name__ if self.pool is not None else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds,
+                "avg_wait_ms": self.wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000
+            }
+        if isinstance(self.pool, QueuePool):
+            stats.update({
+                "size": self.pool.size(),
+                "checked_out": self.pool.checkedout(),
+                "overflow": self.pool.overflow()
+            })
+        return stats
+
+
+def instrumented_pool_class(base, metrics: PoolMetrics):
+    """Subclass a pool class so every checkout records its wait time in metrics"""
+
+    class InstrumentedPool(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Engine.dispose() swaps in a fresh pool built from this class
+            metrics.pool = self
+
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                metrics.record(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
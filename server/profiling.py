@@ -0,0 +1,169 @@
+import contextvars
+import cProfile
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from metrics import route_template
+
+# Statements slower than this are logged with their route, 0 disables the check
+SLOW_QUERY_MS = float(os.environ.get('FOUNDRY_SLOW_QUERY_MS', '250'))
+# cProfile output for profiled requests, one .prof file per request
+PROFILE_DIR = os.environ.get('FOUNDRY_PROFILE_DIR', './profiles')
+# Fraction of admin requests profiled without the header, 0 profiles on request only
+PROFILE_SAMPLE_RATE = float(os.environ.get('FOUNDRY_PROFILE_SAMPLE_RATE', '0'))
+PROFILE_HEADER = "X-Foundry-Profile"
+PROFILE_FILE_HEADER = "X-Foundry-Profile-File"
+
+# Longest statement text written to the slow query log
+MAX_LOGGED_STATEMENT = 2000
+
+logger = logging.getLogger("slow_queries")
+logger.setLevel(logging.INFO)
+
+# ASGI scope of the request running in this context, for attributing queries to routes
+_current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("current_scope", default=None)
+
+
+class ProfilingStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.slow_queries = 0
+        self.profiles_written = 0
+        self.profiles_skipped = 0
+
+    def record(self, slow_queries: int = 0, profiles_written: int = 0, profiles_skipped: int = 0):
+        with self._lock:
+            self.slow_queries += slow_queries
+            self.profiles_written += profiles_written
+            self.profiles_skipped += profiles_skipped
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "slow_query_ms": SLOW_QUERY_MS,
+                "slow_queries": self.slow_queries,
+                "profile_dir": PROFILE_DIR,
+                "profile_sample_rate": PROFILE_SAMPLE_RATE,
+                "profiles_written": self.profiles_written,
+                "profiles_skipped": self.profiles_skipped
+            }
+
+
+profiling_stats = ProfilingStats()
+
+
+def current_route() -> str:
+    """Method and route template of the request issuing a statement, or "-" outside requests"""
+    scope = _current_scope.get()
+    if scope is None:
+        return "-"
+    return f"{scope['method']} {route_template(scope)}"
+
+
+def slow_query_log(threshold_ms: float = SLOW_QUERY_MS) -> Optional[Callable[[str, float], None]]:
+    """Query observer for metrics.instrument_engine logging statements slower than threshold_ms"""
+    if threshold_ms <= 0:
+        return None
+    threshold = threshold_ms / 1000
+
+    def log_slow_query(statement: str, elapsed: float):
+        if elapsed < threshold:
+            return
+        profiling_stats.record(slow_queries=1)
+        logger.warning(
+            "Slow query %.1f ms on %s: %s",
+            elapsed * 1000, current_route(), " ".join(statement.split())[:MAX_LOGGED_STATEMENT]
+        )
+
+    return log_slow_query
+
+
+def bearer_token(headers: Headers) -> Optional[str]:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip()
+
+
+_profile_ids = itertools.count(1)
+
+
+def profile_filename(scope) -> str:
+    path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}-{scope['method']}-{path[:80]}-{os.getpid()}-{next(_profile_ids)}.prof"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware tracking the current request for the slow query log and profiling admin requests on demand"""
+
+    def __init__(
+        self,
+        app,
+        authorize: Callable[[str], Awaitable[bool]],
+        profile_dir: str = PROFILE_DIR,
+        sample_rate: float = PROFILE_SAMPLE_RATE
+    ):
+        self.app = app
+        self.authorize = authorize
+        self.profile_dir = profile_dir
+        self.sample_rate = sample_rate
+        # cProfile observes the whole thread, so only one request is profiled at a time
+        self._profiling = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            if await self.wants_profile(scope):
+                await self.profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+    async def wants_profile(self, scope) -> bool:
+        headers = Headers(scope=scope)
+        requested = headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes")
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled):
+            return False
+        token = bearer_token(headers)
+        return token is not None and await self.authorize(token)
+
+    async def profile(self, scope, receive, send):
+        if not self._profiling.acquire(blocking=False):
+            profiling_stats.record(profiles_skipped=1)
+            await self.app(scope, receive, send)
+            return
+
+        filename = profile_filename(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"])[PROFILE_FILE_HEADER] = filename
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, filename))
+            profiling_stats.record(profiles_written=1)
+        finally:
+            self._profiling.release()
@@ -1,30 +1,45 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload, raiseload
 from starlette import status
-from database import SessionLocal, get_db
-from model import Admin, Component, Category, CodeSnippet, CategoryType
+from database import get_db, AsyncSessionLocal, pool_metrics, async_pool_metrics
+from model import Component, CodeSnippet
 import schemas
-from routers.auth import get_current_admin
+from categories import resolve_category, category_by_id, category_ids
+from routers.auth import get_current_admin, password_hasher, token_cache, admin_cache, AdminPrincipal
+from cache import (
+    response_cache,
+    COMPONENT_LIST_TAG,
+    component_tag,
+    category_tag,
+)
+from pagination import paginate, apply_next_cursor, id_path
+from blobs import store_blob, release_blobs, blob_cache, storage_report
+from highlighting import store_highlight, language_key
+from versioning import bump_catalog_version, version_tracker
+from compression import compression_stats
+from profiling import profiling_stats
+from serialization import render
+from bulk import (
+    IMPORT_BATCH_SIZE,
+    EXPORT_BATCH_SIZE,
+    NDJSON_MEDIA_TYPE,
+    numbered_lines,
+    import_components,
+    export_components,
+)
 
 router = APIRouter(
     prefix="/api/admin",
     tags=["admin"]
 )
 
-db_dependency = Annotated[Session, Depends(get_db)]
-admin_dependency = Annotated[Admin, Depends(get_current_admin)]
-
-
-# Initialize default categories
-def init_categories(db: Session):
-    """Initialize default categories if they don't exist"""
-    for category_type in CategoryType:
-        existing = db.query(Category).filter(Category.name == category_type).first()
-        if not existing:
-            new_category = Category(name=category_type)
-            db.add(new_category)
-    db.commit()
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+admin_dependency = Annotated[AdminPrincipal, Depends(get_current_admin)]
 
 
 # Components endpoints
@@ -35,29 +50,11 @@ async def create_component(
     current_admin: admin_dependency
 ):
     """Create a new component (admin only)"""
-    
-    init_categories(db)
-    
-    # Map category string to CategoryType
-    category_mapping = {
-        "frontend": CategoryType.frontend,
-        "backend": CategoryType.backend,
-        "database": CategoryType.database,
-        "devops": CategoryType.devops
-    }
-    
-    category_enum = category_mapping.get(component_data.category)
-    if not category_enum:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid category"
-        )
-    
-    category = db.query(Category).filter(Category.name == category_enum).first()
+    category = resolve_category(component_data.category)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Category not found"
+            detail="Invalid category"
         )
     
     new_component = Component(
@@ -67,14 +64,17 @@ async def create_component(
     )
     
     db.add(new_component)
-    db.commit()
-    db.refresh(new_component)
+    await bump_catalog_version(db)
+    await db.commit()
+    await db.refresh(new_component)
+    
+    response_cache.invalidate(COMPONENT_LIST_TAG, category_tag(category.key))
     
     return {
         "id": new_component.id,
         "title": new_component.title,
         "use_case": new_component.use_case,
-        "category": category.name.value,
+        "category": category.display_name,
         "created_at": new_component.created_at,
         "updated_at": new_component.updated_at
     }
@@ -82,13 +82,16 @@ async def create_component(
 
 @router.get("/components", response_model=List[schemas.ComponentResponse])
 async def list_admin_components(
+    response: Response,
     db: db_dependency,
     current_admin: admin_dependency,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    """List all components (admin only)"""
-    components = db.query(Component).offset(skip).limit(limit).all()
+    """List all components, paged by opaque cursor or by skip/limit (admin only)"""
+    query = select(Component).options(joinedload(Component.category))
+    components = (await db.execute(paginate(query, Component.id, skip, limit, cursor))).scalars().all()
     
     result = []
     for component in components:
@@ -101,17 +104,25 @@ async def list_admin_components(
             "updated_at": component.updated_at
         })
     
-    return result
+    apply_next_cursor(response, result, limit)
+    return render(result, response)
 
 
 @router.get("/components/{component_id}", response_model=schemas.ComponentWithSnippetsResponse)
 async def get_admin_component(
-    component_id: int,
+    component_id: id_path,
+    response: Response,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Get component with snippets (admin only)"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = (
+        await db.execute(
+            select(Component)
+            .options(joinedload(Component.category), selectinload(Component.snippets))
+            .where(Component.id == component_id)
+        )
+    ).scalars().first()
     
     if not component:
         raise HTTPException(
@@ -130,7 +141,7 @@ async def get_admin_component(
         for s in component.snippets
     ]
     
-    return {
+    result = {
         "id": component.id,
         "title": component.title,
         "use_case": component.use_case,
@@ -139,17 +150,20 @@ async def get_admin_component(
         "created_at": component.created_at,
         "updated_at": component.updated_at
     }
+    return render(result, response)
 
 
 @router.put("/components/{component_id}", response_model=schemas.ComponentResponse)
 async def update_component(
-    component_id: int,
+    component_id: id_path,
     component_data: schemas.ComponentUpdate,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Update component (admin only)"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = (
+        await db.execute(select(Component).where(Component.id == component_id))
+    ).scalars().first()
     
     if not component:
         raise HTTPException(
@@ -157,31 +171,33 @@ async def update_component(
             detail="Component not found"
         )
     
+    previous_category = category_by_id(component.category_id)
+    
     if component_data.title:
         component.title = component_data.title
     if component_data.use_case:
         component.use_case = component_data.use_case
+    category = previous_category
     if component_data.category:
-        category_mapping = {
-            "frontend": CategoryType.frontend,
-            "backend": CategoryType.backend,
-            "database": CategoryType.database,
-            "devops": CategoryType.devops
-        }
-        category_enum = category_mapping.get(component_data.category)
-        if category_enum:
-            category = db.query(Category).filter(Category.name == category_enum).first()
-            if category:
-                component.category_id = category.id
+        category = resolve_category(component_data.category) or previous_category
+        component.category_id = category.id
+    
+    await bump_catalog_version(db)
+    await db.commit()
+    await db.refresh(component)
     
-    db.commit()
-    db.refresh(component)
+    response_cache.invalidate(
+        COMPONENT_LIST_TAG,
+        component_tag(component.id),
+        category_tag(previous_category.key),
+        category_tag(category.key)
+    )
     
     return {
         "id": component.id,
         "title": component.title,
         "use_case": component.use_case,
-        "category": component.category.name.value,
+        "category": category.display_name,
         "created_at": component.created_at,
         "updated_at": component.updated_at
     }
@@ -189,12 +205,22 @@ async def update_component(
 
 @router.delete("/components/{component_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_component(
-    component_id: int,
+    component_id: id_path,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Delete component (admin only)"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = (
+        await db.execute(
+            select(Component)
+            .options(
+                selectinload(Component.snippets)
+                .load_only(CodeSnippet.id, CodeSnippet.content_hash)
+                .options(raiseload(CodeSnippet.blob))
+            )
+            .where(Component.id == component_id)
+        )
+    ).scalars().first()
     
     if not component:
         raise HTTPException(
@@ -202,20 +228,34 @@ async def delete_component(
             detail="Component not found"
         )
     
-    db.delete(component)
-    db.commit()
+    category_name = category_by_id(component.category_id).key
+    content_hashes = [s.content_hash for s in component.snippets]
+    
+    await db.delete(component)
+    await db.flush()
+    await release_blobs(db, content_hashes)
+    await bump_catalog_version(db)
+    await db.commit()
+    
+    response_cache.invalidate(
+        COMPONENT_LIST_TAG,
+        component_tag(component_id),
+        category_tag(category_name)
+    )
 
 
 # Code snippets endpoints
 @router.post("/components/{component_id}/snippets", response_model=schemas.CodeSnippetResponse, status_code=status.HTTP_201_CREATED)
 async def create_snippet(
-    component_id: int,
+    component_id: id_path,
     snippet_data: schemas.CodeSnippetCreate,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Add code snippet to component (admin only)"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = (
+        await db.execute(select(Component).where(Component.id == component_id))
+    ).scalars().first()
     
     if not component:
         raise HTTPException(
@@ -223,16 +263,30 @@ async def create_snippet(
             detail="Component not found"
         )
     
+    metadata = await store_blob(db, snippet_data.code)
+    await store_highlight(db, metadata["content_hash"], snippet_data.code, snippet_data.language)
     new_snippet = CodeSnippet(
         filename=snippet_data.filename,
         language=snippet_data.language,
-        code=snippet_data.code,
-        component_id=component_id
+        component_id=component_id,
+        **metadata
     )
     
+    # Snippet writes touch the parent so its ETag and Last-Modified change,
+    # in listings as well as in its detail
+    component.updated_at = datetime.utcnow()
+    category_name = category_by_id(component.category_id).key
+    
     db.add(new_snippet)
-    db.commit()
-    db.refresh(new_snippet)
+    await bump_catalog_version(db)
+    await db.commit()
+    await db.refresh(new_snippet)
+    
+    response_cache.invalidate(
+        COMPONENT_LIST_TAG,
+        component_tag(component_id),
+        category_tag(category_name)
+    )
     
     return {
         "id": new_snippet.id,
@@ -245,13 +299,19 @@ async def create_snippet(
 
 @router.put("/snippets/{snippet_id}", response_model=schemas.CodeSnippetResponse)
 async def update_snippet(
-    snippet_id: int,
+    snippet_id: id_path,
     snippet_data: schemas.CodeSnippetUpdate,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Update code snippet (admin only)"""
-    snippet = db.query(CodeSnippet).filter(CodeSnippet.id == snippet_id).first()
+    snippet = (
+        await db.execute(
+            select(CodeSnippet)
+            .options(joinedload(CodeSnippet.component))
+            .where(CodeSnippet.id == snippet_id)
+        )
+    ).scalars().first()
     
     if not snippet:
         raise HTTPException(
@@ -261,13 +321,34 @@ async def update_snippet(
     
     if snippet_data.filename:
         snippet.filename = snippet_data.filename
+    previous_language = language_key(snippet.language)
     if snippet_data.language:
         snippet.language = snippet_data.language
-    if snippet_data.code:
-        snippet.code = snippet_data.code
+    code = snippet.code
+    released = []
+    if snippet_data.code and snippet_data.code != code:
+        code = snippet_data.code
+        released.append(snippet.content_hash)
+        for name, value in (await store_blob(db, code)).items():
+            setattr(snippet, name, value)
+    # Renditions are keyed by body and language, so other field changes need none
+    if released or language_key(snippet.language) != previous_language:
+        await store_highlight(db, snippet.content_hash, code, snippet.language)
+    
+    snippet.component.updated_at = datetime.utcnow()
+    category_name = category_by_id(snippet.component.category_id).key
+    
+    await db.flush()
+    await release_blobs(db, released)
+    await bump_catalog_version(db)
+    await db.commit()
+    await db.refresh(snippet)
     
-    db.commit()
-    db.refresh(snippet)
+    response_cache.invalidate(
+        COMPONENT_LIST_TAG,
+        component_tag(snippet.component_id),
+        category_tag(category_name)
+    )
     
     return {
         "id": snippet.id,
@@ -280,12 +361,18 @@ async def update_snippet(
 
 @router.delete("/snippets/{snippet_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_snippet(
-    snippet_id: int,
+    snippet_id: id_path,
     db: db_dependency,
     current_admin: admin_dependency
 ):
     """Delete code snippet (admin only)"""
-    snippet = db.query(CodeSnippet).filter(CodeSnippet.id == snippet_id).first()
+    snippet = (
+        await db.execute(
+            select(CodeSnippet)
+            .options(joinedload(CodeSnippet.component))
+            .where(CodeSnippet.id == snippet_id)
+        )
+    ).scalars().first()
     
     if not snippet:
         raise HTTPException(
@@ -293,5 +380,77 @@ async def delete_snippet(
             detail="Snippet not found"
         )
     
-    db.delete(snippet)
-    db.commit()
+    component_id = snippet.component_id
+    snippet.component.updated_at = datetime.utcnow()
+    category_name = category_by_id(snippet.component.category_id).key
+    
+    await db.delete(snippet)
+    await db.flush()
+    await release_blobs(db, [snippet.content_hash])
+    await bump_catalog_version(db)
+    await db.commit()
+    
+    response_cache.invalidate(
+        COMPONENT_LIST_TAG,
+        component_tag(component_id),
+        category_tag(category_name)
+    )
+
+
+# Bulk endpoints
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_catalog(
+    request: Request,
+    db: db_dependency,
+    current_admin: admin_dependency,
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=5000)
+):
+    """Import components with nested snippets from an NDJSON body (admin only)"""
+    result = await import_components(db, numbered_lines(request.stream()), category_ids(), batch_size)
+    
+    if result["components"]:
+        response_cache.invalidate(
+            COMPONENT_LIST_TAG,
+            *(category_tag(name) for name in result.pop("categories"))
+        )
+    return result
+
+
+@router.get("/export")
+async def export_catalog(
+    current_admin: admin_dependency,
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=5000)
+):
+    """Stream every component with its snippets as NDJSON (admin only)"""
+    return StreamingResponse(
+        export_components(AsyncSessionLocal, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="foundry-catalog.ndjson"'}
+    )
+
+
+@router.get("/stats")
+async def get_stats(current_admin: admin_dependency):
+    """Runtime statistics for caches, connection pools, password hashing, profiling and the catalog version (admin only)"""
+    return {
+        "cache": response_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "auth": {
+            "tokens": token_cache.stats(),
+            "admins": admin_cache.stats()
+        },
+        "compression": compression_stats.snapshot(),
+        "profiling": profiling_stats.snapshot(),
+        "catalog_version": version_tracker.stats(),
+        "blobs": blob_cache.stats(),
+        "database_pool": {
+            "requests": async_pool_metrics.stats(),
+            "sync": pool_metrics.stats()
+        }
+    }
+
+
+@router.get("/storage")
+async def get_storage(db: db_dependency, current_admin: admin_dependency):
+    """Snippet storage with and without body deduplication (admin only)"""
+    return await db.run_sync(storage_report)
@@ -1,15 +1,21 @@
+import os
+import time
+from dataclasses import dataclass
 from datetime import timedelta, datetime, timezone
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from database import SessionLocal, get_db
+from database import get_db, AsyncSessionLocal
 from model import Admin
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import jwt, JWTError
 import logging
 import schemas
+from hashing import PasswordHasher, HashQueueFull, HASH_WORKERS, HASH_MAX_PENDING
+from cache import TTLCache
 
 router = APIRouter(
     prefix="/api/auth",
@@ -22,8 +28,18 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 pwd_context = bcrypt_context
+password_hasher = PasswordHasher(bcrypt_context, HASH_WORKERS, HASH_MAX_PENDING)
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Per-process caches that keep the authenticated request path off the database
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('FOUNDRY_TOKEN_CACHE_MAX_ENTRIES', '4096'))
+ADMIN_CACHE_TTL_SECONDS = float(os.environ.get('FOUNDRY_ADMIN_CACHE_TTL_SECONDS', '30'))
+
+# Decoded payloads keyed by token string, each kept until its own exp claim
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# Admin principals keyed by id, short-lived and dropped on any admin row change
+admin_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, ADMIN_CACHE_TTL_SECONDS)
+
 logger = logging.getLogger("auth")
 logger.setLevel(logging.INFO)
 
@@ -31,16 +47,102 @@ logger.setLevel(logging.INFO)
 
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+
+
+@dataclass(frozen=True)
+class AdminPrincipal:
+    """Detached snapshot of the authenticated admin, safe to share across requests"""
+    id: int
+    username: str
+    email: str
+    role: str
+
+
+@event.listens_for(Admin, "after_update")
+@event.listens_for(Admin, "after_delete")
+def invalidate_admin(mapper, connection, target):
+    """Role changes and deletions must take effect on the next request"""
+    admin_cache.delete(target.id)
+
+
+def decode_token(token: str) -> dict:
+    """Decode and verify a JWT, memoized by token string for its remaining lifetime"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
+    payload = jwt.decode(
+        token,
+        SECRET_KEY,
+        algorithms=[ALGORITHM],
+    )
+    
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        token_cache.set(token, payload, ttl_seconds=expires_in)
+    return payload
+
+
+async def load_admin(admin_id: int, db: AsyncSession):
+    """The cached principal for an admin id, read from the database on a miss, or None if the admin is gone"""
+    principal = admin_cache.get(admin_id)
+    if principal is not None:
+        return principal
+    
+    admin = (
+        await db.execute(select(Admin).where(Admin.id == admin_id))
+    ).scalars().first()
+    if not admin:
+        return None
+    
+    principal = AdminPrincipal(
+        id=admin.id,
+        username=admin.username,
+        email=admin.email,
+        role=admin.role
+    )
+    admin_cache.set(admin_id, principal)
+    return principal
+
+
+async def is_admin_token(token: str) -> bool:
+    """Whether a bearer token is a valid, unexpired token of an admin that still exists"""
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return False
+    admin_id = payload.get("id")
+    if payload.get("sub") is None or admin_id is None:
+        return False
+    if admin_cache.get(admin_id) is not None:
+        return True
+    async with AsyncSessionLocal() as db:
+        return await load_admin(admin_id, db) is not None
+
+
+def hashing_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"}
+    )
 
 
-def authenticate_admin(username: str, password: str, db: Session):
-    admin = db.query(Admin).filter(Admin.username == username).first()
+async def authenticate_admin(username: str, password: str, db: AsyncSession):
+    admin = (
+        await db.execute(select(Admin).where(Admin.username == username))
+    ).scalars().first()
     
     if not admin:
         return False
     
-    if not bcrypt_context.verify(password, admin.hashed_password):
+    try:
+        verified = await password_hasher.verify(password, admin.hashed_password)
+    except HashQueueFull:
+        raise hashing_overloaded()
+    
+    if not verified:
         return False
     
     return admin
@@ -59,11 +161,7 @@ def create_access_token(username: str, admin_id: int, expires_delta: timedelta)
 
 async def get_current_admin(token: Annotated[str, Depends(oauth2_bearer)], db: db_dependency):
     try:
-        payload = jwt.decode(
-            token,
-            SECRET_KEY,
-            algorithms=[ALGORITHM],
-        )
+        payload = decode_token(token)
         
         username: str = payload.get("sub")
         admin_id: int = payload.get("id")
@@ -74,14 +172,13 @@ async def get_current_admin(token: Annotated[str, Depends(oauth2_bearer)], db: d
                 detail="Invalid authentication token"
             )
         
-        admin = db.query(Admin).filter(Admin.id == admin_id).first()
-        if not admin:
+        principal = await load_admin(admin_id, db)
+        if principal is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Admin not found"
             )
-        
-        return admin
+        return principal
     
     except JWTError:
         raise HTTPException(
@@ -98,10 +195,14 @@ async def register_admin(
     """Register a new admin user"""
     
     # Check if this specific username or email already exists
-    existing_admin = db.query(Admin).filter(
-        (Admin.username == admin_data.username) |
-        (Admin.email == admin_data.email)
-    ).first()
+    existing_admin = (
+        await db.execute(
+            select(Admin).where(
+                (Admin.username == admin_data.username) |
+                (Admin.email == admin_data.email)
+            )
+        )
+    ).scalars().first()
     
     if existing_admin:
         raise HTTPException(
@@ -109,7 +210,10 @@ async def register_admin(
             detail="Username or email already registered"
         )
     
-    hashed_password = bcrypt_context.hash(admin_data.password)
+    try:
+        hashed_password = await password_hasher.hash(admin_data.password)
+    except HashQueueFull:
+        raise hashing_overloaded()
     
     new_admin = Admin(
         username=admin_data.username,
@@ -119,8 +223,8 @@ async def register_admin(
     )
     
     db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    await db.commit()
+    await db.refresh(new_admin)
     
     logger.info(f"Admin '{admin_data.username}' registered successfully")
     
@@ -134,7 +238,7 @@ async def login_admin(
 ):
     """Admin login endpoint"""
     
-    admin = authenticate_admin(form_data.username, form_data.password, db)
+    admin = await authenticate_admin(form_data.username, form_data.password, db)
     
     if not admin:
         raise HTTPException(
@@ -159,6 +263,6 @@ async def login_admin(
 
 
 @router.get("/admin", response_model=schemas.AdminResponse)
-async def get_current_admin_info(current_admin: Annotated[Admin, Depends(get_current_admin)]):
+async def get_current_admin_info(current_admin: Annotated[AdminPrincipal, Depends(get_current_admin)]):
     """Get current admin user info"""
     return current_admin
@@ -1,10 +1,38 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import os
+from typing import Annotated, List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload, load_only, raiseload
 from starlette import status
-from database import SessionLocal, get_db
+from database import get_db
 from model import Component, Category, CodeSnippet
+from categories import resolve_category, category_by_id
 import schemas
+from cache import (
+    response_cache,
+    CATEGORIES_TAG,
+    COMPONENT_LIST_TAG,
+    component_tag,
+    category_tag,
+)
+from conditional import (
+    Validators,
+    make_etag,
+    latest,
+    has_conditional_headers,
+    is_not_modified,
+    not_modified_response,
+    apply_validators,
+)
+from pagination import paginate, apply_next_cursor, id_path, MIN_ID, MAX_ID
+from search import search_catalog, search_supported
+from snippets import RangeNotSatisfiable, parse_range, iter_chunks
+from blobs import blob_bytes
+from highlighting import load_highlights
+from versioning import read_catalog_version, version_tracker
+from serialization import render
 
 router = APIRouter(
     prefix="/api",
@@ -15,30 +43,111 @@ router = APIRouter(
 
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
+# Most components one /components/batch request may ask for
+BATCH_MAX_IDS = int(os.environ.get('FOUNDRY_BATCH_MAX_IDS', '100'))
 
-@router.get("/categories", response_model=List[schemas.CategoryResponse])
-async def get_categories(db: db_dependency):
-    """Get all categories"""
-    categories = db.query(Category).all()
-    return [
-        {
-            "id": c.id,
-            "name": c.name.value
-        }
-        for c in categories
-    ]
+
+def list_validators(cache_key, components) -> Validators:
+    """Validators for a component listing, derived from row ids and update times"""
+    # No Last-Modified: deleting a row changes the listing without advancing any
+    # remaining updated_at, so only the ETag, which covers the ids, is reliable
+    return Validators(
+        etag=make_etag(cache_key, [(c["id"], c["updated_at"]) for c in components])
+    )
+
+
+def respond(request: Request, response: Response, result, validators: Validators):
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    apply_validators(response, validators)
+    return render(result, response)
+
+
+@router.get(
+    "/categories",
+    response_model=List[Union[schemas.CategoryWithCountResponse, schemas.CategoryResponse]]
+)
+async def get_categories(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    include_counts: bool = False
+):
+    """Get all categories, optionally with their component counts"""
+    cache_key = ("categories", include_counts)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return respond(request, response, *cached)
+    generation = response_cache.generation
+    
+    if include_counts:
+        # One GROUP BY instead of a component listing per category
+        rows = (
+            await db.execute(
+                select(Category.id, Category.name, func.count(Component.id).label("component_count"))
+                .outerjoin(Component, Component.category_id == Category.id)
+                .group_by(Category.id, Category.name)
+                .order_by(Category.id)
+            )
+        ).all()
+        result = [
+            {
+                "id": row.id,
+                "name": row.name.value,
+                "component_count": row.component_count
+            }
+            for row in rows
+        ]
+        tags = (CATEGORIES_TAG, COMPONENT_LIST_TAG)
+    else:
+        categories = (await db.execute(select(Category))).scalars().all()
+        result = [
+            {
+                "id": c.id,
+                "name": c.name.value
+            }
+            for c in categories
+        ]
+        tags = (CATEGORIES_TAG,)
+    validators = Validators(etag=make_etag(cache_key, [tuple(c.values()) for c in result]))
+    
+    response_cache.set(cache_key, (result, validators), tags=tags, generation=generation)
+    return respond(request, response, result, validators)
+
+
+@router.get("/catalog/version", response_model=schemas.CatalogVersionResponse)
+async def get_catalog_version(request: Request, response: Response, db: db_dependency):
+    """Current catalog version; it changes whenever an admin write commits"""
+    version, updated_at = await read_catalog_version(db)
+    version_tracker.observe(version)
+    
+    # Pollers send If-None-Match and get an empty 304 until something changes
+    validators = Validators(etag=f'"{version}"', last_modified=updated_at)
+    result = {"version": version, "updated_at": updated_at}
+    return respond(request, response, result, validators)
 
 
 @router.get("/components", response_model=List[schemas.ComponentResponse])
 async def list_components(
+    request: Request,
+    response: Response,
     db: db_dependency,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    """Get all components"""
-    components = db.query(Component).offset(skip).limit(limit).all()
+    """Get all components, paged by opaque cursor or by skip/limit"""
+    cache_key = ("components", skip, limit, cursor)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        apply_next_cursor(response, cached[0], limit)
+        return respond(request, response, *cached)
+    generation = response_cache.generation
+    
+    query = select(Component).options(joinedload(Component.category))
+    components = (await db.execute(paginate(query, Component.id, skip, limit, cursor))).scalars().all()
     
     result = []
     for component in components:
@@ -50,64 +159,260 @@ async def list_components(
             "created_at": component.created_at,
             "updated_at": component.updated_at
         })
+    validators = list_validators(cache_key, result)
     
-    return result
+    response_cache.set(cache_key, (result, validators), tags=(COMPONENT_LIST_TAG,), generation=generation)
+    apply_next_cursor(response, result, limit)
+    return respond(request, response, result, validators)
 
 
 @router.get("/categories/{category_name}/components", response_model=List[schemas.ComponentResponse])
 async def get_components_by_category(
     category_name: str,
-    db: db_dependency
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    skip: int = 0,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None
 ):
-    """Get components by category name"""
-    from server.model import CategoryType
-    
-    # Map category name to enum
-    category_mapping = {
-        "frontend": CategoryType.frontend,
-        "backend": CategoryType.backend,
-        "database": CategoryType.database,
-        "devops": CategoryType.devops
-    }
-    
-    category_enum = category_mapping.get(category_name.lower())
-    if not category_enum:
+    """Get components by category name; unpaged unless limit or cursor is given"""
+    category = resolve_category(category_name)
+    if not category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid category name"
         )
     
-    category = db.query(Category).filter(Category.name == category_enum).first()
+    if cursor is not None and limit is None:
+        limit = 100
     
-    if not category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found"
-        )
+    cache_key = ("category_components", category.key, skip, limit, cursor)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        if limit is not None:
+            apply_next_cursor(response, cached[0], limit)
+        return respond(request, response, *cached)
+    generation = response_cache.generation
     
-    components = db.query(Component).filter(Component.category_id == category.id).all()
+    # Plain columns joined to the category name; no ORM entities to hydrate
+    query = (
+        select(
+            Component.id,
+            Component.title,
+            Component.use_case,
+            Category.name.label("category"),
+            Component.created_at,
+            Component.updated_at
+        )
+        .join(Category, Component.category_id == Category.id)
+        .where(Component.category_id == category.id)
+    )
+    rows = (await db.execute(paginate(query, Component.id, skip, limit, cursor))).all()
     
     result = []
-    for component in components:
+    for row in rows:
         result.append({
-            "id": component.id,
-            "title": component.title,
-            "use_case": component.use_case,
-            "category": component.category.name.value,
-            "created_at": component.created_at,
-            "updated_at": component.updated_at
+            "id": row.id,
+            "title": row.title,
+            "use_case": row.use_case,
+            "category": row.category.value,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at
         })
+    validators = list_validators(cache_key, result)
+    
+    response_cache.set(cache_key, (result, validators), tags=(category_tag(category.key),), generation=generation)
+    if limit is not None:
+        apply_next_cursor(response, result, limit)
+    return respond(request, response, result, validators)
+
+
+async def detail_validators(db: AsyncSession, component_id: int, fields: str = "full"):
+    """Validators for a component detail, computed without loading snippet bodies"""
+    row = (
+        await db.execute(
+            select(Component.id, Component.updated_at).where(Component.id == component_id)
+        )
+    ).first()
+    if not row:
+        return None
     
-    return result
+    snippet_rows = (
+        await db.execute(
+            select(CodeSnippet.id, CodeSnippet.created_at, CodeSnippet.content_hash)
+            .where(CodeSnippet.component_id == component_id)
+            .order_by(CodeSnippet.id)
+        )
+    ).all()
+    return component_validators(fields, row.id, row.updated_at, [tuple(s) for s in snippet_rows])
 
 
-@router.get("/components/{component_id}", response_model=schemas.ComponentWithSnippetsResponse)
+def component_validators(fields: str, component_id: int, updated_at, snippet_rows) -> Validators:
+    """Validators for a component detail from its update time and id-ordered (id, created_at, content_hash) snippet rows"""
+    return Validators(
+        etag=make_etag("component", fields, component_id, updated_at, snippet_rows),
+        last_modified=latest(updated_at, *(created_at for _, created_at, _ in snippet_rows))
+    )
+
+
+def parse_ids(ids: str) -> List[int]:
+    """Distinct ids from a comma-separated list, in request order"""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers"
+        )
+    # Repeats of an id cost nothing, so only distinct ids count towards the cap
+    distinct = list(dict.fromkeys(parsed))
+    if not distinct or len(distinct) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must list between 1 and {BATCH_MAX_IDS} components"
+        )
+    if any(not MIN_ID <= component_id <= MAX_ID for component_id in distinct):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"ids must be between {MIN_ID} and {MAX_ID}"
+        )
+    return distinct
+
+
+# Registered before /components/{component_id}, which would otherwise reject "batch" as an id
+@router.get("/components/batch", response_model=schemas.ComponentBatchResponse)
+async def get_component_batch(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    ids: str = Query(..., description="Comma-separated component ids")
+):
+    """Get several components with their snippets; ids that do not exist are listed under missing"""
+    component_ids = parse_ids(ids)
+    cache_key = ("components:batch", tuple(component_ids))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return respond(request, response, *cached)
+    generation = response_cache.generation
+    
+    # One IN query for the components and one selectin query for all their snippets;
+    # category names come from the in-process map
+    components = (
+        await db.execute(
+            select(Component)
+            .options(selectinload(Component.snippets))
+            .where(Component.id.in_(component_ids))
+        )
+    ).scalars().all()
+    by_id = {component.id: component for component in components}
+    
+    result = {
+        "components": [
+            {
+                "id": component.id,
+                "title": component.title,
+                "use_case": component.use_case,
+                "category": category_by_id(component.category_id).display_name,
+                "snippets": [
+                    {
+                        "id": s.id,
+                        "filename": s.filename,
+                        "language": s.language,
+                        "code": s.code,
+                        "created_at": s.created_at
+                    }
+                    for s in component.snippets
+                ],
+                "created_at": component.created_at,
+                "updated_at": component.updated_at
+            }
+            for component in (by_id[i] for i in component_ids if i in by_id)
+        ],
+        "missing": [i for i in component_ids if i not in by_id]
+    }
+    validators = Validators(
+        etag=make_etag(cache_key, [
+            (c.id, c.updated_at, [(s.id, s.created_at, s.content_hash) for s in c.snippets])
+            for c in components
+        ]),
+        last_modified=latest(*(c.updated_at for c in components))
+    )
+    
+    # Missing ids can be created later, which invalidates the listing tag
+    tags = [component_tag(i) for i in by_id]
+    if result["missing"]:
+        tags.append(COMPONENT_LIST_TAG)
+    response_cache.set(cache_key, (result, validators), tags=tags, generation=generation)
+    return respond(request, response, result, validators)
+
+
+@router.get(
+    "/components/{component_id}",
+    response_model=Union[
+        schemas.ComponentHighlightedResponse,
+        schemas.ComponentWithSnippetsResponse,
+        schemas.ComponentSummaryResponse
+    ]
+)
 async def get_component_detail(
-    component_id: int,
-    db: db_dependency
+    component_id: id_path,
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    fields: Literal["full", "summary"] = "full",
+    render_as: Optional[Literal["html"]] = Query(None, alias="render")
 ):
-    """Get component with all code snippets"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    """Get component with all code snippets, only snippet metadata with fields=summary, or highlighted HTML with render=html"""
+    if render_as and fields == "summary":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="render=html needs snippet bodies and cannot be combined with fields=summary"
+        )
+    
+    variant = fields if render_as is None else f"{fields}:{render_as}"
+    cache_key = ("component", component_id, variant)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return respond(request, response, *cached)
+    generation = response_cache.generation
+    
+    # Checking validators first saves loading the snippets only when the client has a copy
+    if has_conditional_headers(request):
+        validators = await detail_validators(db, component_id, variant)
+        
+        if not validators:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Component not found"
+            )
+        
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+    
+    snippet_loader = selectinload(Component.snippets)
+    if fields == "summary":
+        # Leave the blobs unjoined; clients fetch bodies from /snippets/{id}/raw
+        snippet_loader = snippet_loader.options(
+            load_only(
+                CodeSnippet.id,
+                CodeSnippet.filename,
+                CodeSnippet.language,
+                CodeSnippet.byte_size,
+                CodeSnippet.line_count,
+                CodeSnippet.content_hash,
+                CodeSnippet.created_at
+            ),
+            raiseload(CodeSnippet.blob)
+        )
+    
+    component = (
+        await db.execute(
+            select(Component)
+            .options(joinedload(Component.category), snippet_loader)
+            .where(Component.id == component_id)
+        )
+    ).scalars().first()
     
     if not component:
         raise HTTPException(
@@ -115,18 +420,36 @@ async def get_component_detail(
             detail="Component not found"
         )
     
-    snippets = [
-        {
-            "id": s.id,
-            "filename": s.filename,
-            "language": s.language,
-            "code": s.code,
-            "created_at": s.created_at
-        }
-        for s in component.snippets
-    ]
+    if fields == "summary":
+        snippets = [
+            {
+                "id": s.id,
+                "filename": s.filename,
+                "language": s.language,
+                "byte_size": s.byte_size,
+                "line_count": s.line_count,
+                "content_hash": s.content_hash,
+                "created_at": s.created_at
+            }
+            for s in component.snippets
+        ]
+    else:
+        snippets = [
+            {
+                "id": s.id,
+                "filename": s.filename,
+                "language": s.language,
+                "code": s.code,
+                "created_at": s.created_at
+            }
+            for s in component.snippets
+        ]
+        if render_as == "html":
+            highlights = await load_highlights(db, component.snippets)
+            for snippet in snippets:
+                snippet["html"] = highlights[snippet["id"]]
     
-    return {
+    result = {
         "id": component.id,
         "title": component.title,
         "use_case": component.use_case,
@@ -135,3 +458,94 @@ async def get_component_detail(
         "created_at": component.created_at,
         "updated_at": component.updated_at
     }
+    validators = component_validators(
+        variant,
+        component.id,
+        component.updated_at,
+        sorted((s.id, s.created_at, s.content_hash) for s in component.snippets)
+    )
+    
+    response_cache.set(cache_key, (result, validators), tags=(component_tag(component_id),), generation=generation)
+    return respond(request, response, result, validators)
+
+
+@router.get("/snippets/{snippet_id}/raw", response_class=StreamingResponse)
+async def get_snippet_raw(snippet_id: id_path, request: Request, db: db_dependency):
+    """Stream a snippet's code as text/plain, honouring single byte ranges"""
+    content_hash = (
+        await db.execute(select(CodeSnippet.content_hash).where(CodeSnippet.id == snippet_id))
+    ).scalar()
+    
+    if not content_hash:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snippet not found"
+        )
+    
+    # The content hash names the body, so it is both the ETag and the blob cache key
+    validators = Validators(etag=f'"{content_hash}"')
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    
+    body = await blob_bytes(db, content_hash)
+    headers = {**validators.headers(), "Accept-Ranges": "bytes"}
+    
+    # A stale If-Range means the client's partial copy is outdated, so send everything
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range") if not if_range or if_range == validators.etag else None
+    
+    try:
+        byte_range = parse_range(range_header, len(body))
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{len(body)}"}
+        )
+    
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        body = body[start:end + 1]
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    headers["Content-Length"] = str(len(body))
+    
+    return StreamingResponse(
+        iter_chunks(body),
+        status_code=status_code,
+        media_type="text/plain; charset=utf-8",
+        headers=headers
+    )
+
+
+@router.get("/search", response_model=List[schemas.SearchResult])
+async def search(
+    response: Response,
+    db: db_dependency,
+    q: str = Query(min_length=1, max_length=200),
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Ranked full-text search over component text and snippet code"""
+    if not search_supported(db.bind):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search requires the SQLite FTS5 backend"
+        )
+    
+    category_enum = None
+    if category:
+        category_ref = resolve_category(category)
+        if not category_ref:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid category name"
+            )
+        category_enum = category_ref.type
+    
+    results = await db.run_sync(
+        lambda session: search_catalog(session, q, category_enum, language, limit, offset)
+    )
+    return render(results, response)
@@ -68,6 +68,20 @@ class CodeSnippetResponse(BaseModel):
         from_attributes = True
 
 
+class CodeSnippetHighlighted(CodeSnippetResponse):
+    html: str
+
+
+class CodeSnippetSummary(BaseModel):
+    id: int
+    filename: str
+    language: str
+    byte_size: Optional[int] = None
+    line_count: Optional[int] = None
+    content_hash: Optional[str] = None
+    created_at: datetime
+
+
 # Component schemas
 class ComponentCreate(BaseModel):
     title: str = Field(min_length=3, max_length=255)
@@ -106,6 +120,20 @@ class ComponentWithSnippetsResponse(BaseModel):
         from_attributes = True
 
 
+class ComponentHighlightedResponse(ComponentWithSnippetsResponse):
+    snippets: List[CodeSnippetHighlighted]
+
+
+class ComponentSummaryResponse(BaseModel):
+    id: int
+    title: str
+    use_case: str
+    category: str
+    snippets: List[CodeSnippetSummary]
+    created_at: datetime
+    updated_at: datetime
+
+
 # Category schemas
 class CategoryResponse(BaseModel):
     id: int
@@ -113,3 +141,47 @@ class CategoryResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CategoryWithCountResponse(CategoryResponse):
+    component_count: int
+
+
+class ComponentBatchResponse(BaseModel):
+    components: List[ComponentWithSnippetsResponse]
+    missing: List[int]
+
+
+# Catalog version schemas
+class CatalogVersionResponse(BaseModel):
+    version: int
+    updated_at: Optional[datetime] = None
+
+
+# Search schemas
+class SearchResult(BaseModel):
+    kind: Literal["component", "snippet"]
+    component_id: int
+    snippet_id: Optional[int] = None
+    title: str
+    category: str
+    filename: Optional[str] = None
+    language: Optional[str] = None
+    highlight: str
+    score: float
+
+
+# Bulk import schemas
+class ComponentImport(ComponentCreate):
+    snippets: List[CodeSnippetCreate] = []
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    components: int
+    snippets: int
+    errors: List[ImportRowError]
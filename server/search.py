@@ -0,0 +1,188 @@
+import html
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from model import CategoryType
+
+# FTS5 indexes over the catalog. Both are external-content tables, so they hold
+# only the inverted index and read the text back from the source tables.
+# Snippet bodies live in snippet_blobs, so snippet_fts reads through a view.
+SEARCH_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS component_fts USING fts5(
+        title, use_case,
+        content='components', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS snippet_documents AS
+    SELECT s.id AS id, s.filename AS filename, b.code AS code
+    FROM code_snippets s JOIN snippet_blobs b ON b.content_hash = s.content_hash
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS snippet_fts USING fts5(
+        filename, code,
+        content='snippet_documents', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS components_fts_insert AFTER INSERT ON components BEGIN
+        INSERT INTO component_fts(rowid, title, use_case) VALUES (new.id, new.title, new.use_case);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS components_fts_delete AFTER DELETE ON components BEGIN
+        INSERT INTO component_fts(component_fts, rowid, title, use_case)
+        VALUES ('delete', old.id, old.title, old.use_case);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS components_fts_update AFTER UPDATE OF title, use_case ON components BEGIN
+        INSERT INTO component_fts(component_fts, rowid, title, use_case)
+        VALUES ('delete', old.id, old.title, old.use_case);
+        INSERT INTO component_fts(rowid, title, use_case) VALUES (new.id, new.title, new.use_case);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS code_snippets_fts_insert AFTER INSERT ON code_snippets BEGIN
+        INSERT INTO snippet_fts(rowid, filename, code)
+        SELECT new.id, new.filename, code FROM snippet_blobs WHERE content_hash = new.content_hash;
+    END
+    """,
+    # Blobs are released only after their snippets are deleted, so old bodies are still readable here
+    """
+    CREATE TRIGGER IF NOT EXISTS code_snippets_fts_delete AFTER DELETE ON code_snippets BEGIN
+        INSERT INTO snippet_fts(snippet_fts, rowid, filename, code)
+        SELECT 'delete', old.id, old.filename, code FROM snippet_blobs WHERE content_hash = old.content_hash;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS code_snippets_fts_update AFTER UPDATE OF filename, content_hash ON code_snippets BEGIN
+        INSERT INTO snippet_fts(snippet_fts, rowid, filename, code)
+        SELECT 'delete', old.id, old.filename, code FROM snippet_blobs WHERE content_hash = old.content_hash;
+        INSERT INTO snippet_fts(rowid, filename, code)
+        SELECT new.id, new.filename, code FROM snippet_blobs WHERE content_hash = new.content_hash;
+    END
+    """,
+]
+
+# Column weights for bm25(); titles and filenames count for more than bodies
+COMPONENT_WEIGHTS = "10.0, 2.0"
+SNIPPET_WEIGHTS = "6.0, 1.0"
+
+# Sentinels passed to snippet() so matches can be marked after HTML-escaping
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+
+def search_supported(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index(engine: Engine):
+    """Create the FTS5 tables and sync triggers, backfilling them on first creation"""
+    if not search_supported(engine):
+        return
+
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE name IN ('component_fts', 'snippet_fts')")
+        ).scalars().all()
+        for statement in SEARCH_SCHEMA:
+            conn.execute(text(statement))
+        if "component_fts" not in existing:
+            conn.execute(text("INSERT INTO component_fts(component_fts) VALUES ('rebuild')"))
+        if "snippet_fts" not in existing:
+            conn.execute(text("INSERT INTO snippet_fts(snippet_fts) VALUES ('rebuild')"))
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 expression of quoted terms, prefix-matching the last"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def render_highlight(fragment: Optional[str]) -> str:
+    escaped = html.escape(fragment or "")
+    return escaped.replace(_MATCH_START, "<mark>").replace(_MATCH_END, "</mark>")
+
+
+def search_catalog(
+    conn,
+    query: str,
+    category: Optional[CategoryType] = None,
+    language: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> list:
+    """Run a ranked search over component text and snippet code"""
+    match = build_match_query(query)
+    if match is None:
+        return []
+
+    params = {
+        "match": match,
+        "start": _MATCH_START,
+        "end": _MATCH_END,
+        "limit": limit,
+        "offset": offset
+    }
+    category_filter = ""
+    if category is not None:
+        category_filter = "AND cat.name = :category"
+        params["category"] = category.name
+
+    branches = []
+    # Components carry no language, so a language filter only matches snippets
+    if language is None:
+        branches.append(f"""
+            SELECT 'component' AS kind, c.id AS component_id, NULL AS snippet_id,
+                   c.title AS title, cat.name AS category, NULL AS filename, NULL AS language,
+                   snippet(component_fts, -1, :start, :end, '...', 16) AS highlight,
+                   bm25(component_fts, {COMPONENT_WEIGHTS}) AS score
+            FROM component_fts
+            JOIN components c ON c.id = component_fts.rowid
+            JOIN categories cat ON cat.id = c.category_id
+            WHERE component_fts MATCH :match {category_filter}
+        """)
+
+    language_filter = ""
+    if language is not None:
+        language_filter = "AND lower(s.language) = lower(:language)"
+        params["language"] = language
+    branches.append(f"""
+        SELECT 'snippet' AS kind, c.id AS component_id, s.id AS snippet_id,
+               c.title AS title, cat.name AS category, s.filename AS filename, s.language AS language,
+               snippet(snippet_fts, -1, :start, :end, '...', 16) AS highlight,
+               bm25(snippet_fts, {SNIPPET_WEIGHTS}) AS score
+        FROM snippet_fts
+        JOIN code_snippets s ON s.id = snippet_fts.rowid
+        JOIN components c ON c.id = s.component_id
+        JOIN categories cat ON cat.id = c.category_id
+        WHERE snippet_fts MATCH :match {category_filter} {language_filter}
+    """)
+
+    sql = " UNION ALL ".join(branches) + " ORDER BY score LIMIT :limit OFFSET :offset"
+    rows = conn.execute(text(sql), params).mappings().all()
+
+    return [
+        {
+            "kind": row["kind"],
+            "component_id": row["component_id"],
+            "snippet_id": row["snippet_id"],
+            "title": row["title"],
+            "category": CategoryType[row["category"]].value,
+            "filename": row["filename"],
+            "language": row["language"],
+            "highlight": render_highlight(row["highlight"]),
+            # bm25() is lower-is-better; flip it so clients sort descending
+            "score": -row["score"]
+        }
+        for row in rows
+    ]
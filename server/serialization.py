@@ -0,0 +1,39 @@
+import os
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to pydantic-core's encoder
+    orjson = None
+    from pydantic_core import to_json
+
+# Return pre-encoded JSON bytes from read routes instead of re-validating dicts
+# through their response_model; off unless the deployment opts in
+FAST_JSON = os.environ.get('FOUNDRY_FAST_JSON', '').lower() in ('1', 'true', 'yes')
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(content) -> bytes:
+    """Encode handler output (dicts, lists, datetimes) to the same JSON FastAPI emits"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+def json_bytes_response(content, response: Response = None, status_code: int = 200) -> Response:
+    """A pre-encoded JSON response carrying any headers already set on the injected Response"""
+    encoded = Response(content=dumps(content), status_code=status_code, media_type=JSON_MEDIA_TYPE)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name not in ("content-length", "content-type"):
+                encoded.headers[name] = value
+    return encoded
+
+
+def render(content, response: Response = None):
+    """Hand content to FastAPI as-is, or pre-encoded when the fast path is enabled"""
+    if not FAST_JSON:
+        return content
+    return json_bytes_response(content, response)
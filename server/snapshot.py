@@ -0,0 +1,345 @@
+"""Static, precompressed JSON snapshot of the public catalog API.
+
+Each public GET is rendered to a file named after its URL, so nginx or any
+static file server can answer catalog reads without the app:
+
+    python snapshot.py [--out DIR] [--full]
+
+Runs are incremental. Component details are rebuilt only for components
+whose updated_at changed since the previous run, and listing files are
+rewritten only when their bytes change, so unchanged files keep their
+mtime (and the ETag a static server derives from it).
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+import schemas
+from categories import category_ids, load_categories
+from compression import brotli
+from highlighting import highlight_html, language_key
+from model import Category, Component, SnippetHighlight
+from pagination import encode_cursor
+from versioning import catalog_version_query
+
+SNAPSHOT_DIR = os.environ.get('FOUNDRY_SNAPSHOT_DIR', './snapshot')
+# Page size of the static /api/components views; matches the endpoint's default limit
+SNAPSHOT_PAGE_SIZE = 100
+DETAIL_BATCH_SIZE = 200
+# Compressed once offline, so spend the CPU on the smallest files
+SNAPSHOT_GZIP_LEVEL = 9
+SNAPSHOT_BROTLI_QUALITY = 11
+
+MANIFEST_NAME = ".snapshot-manifest.json"
+INDEX_NAME = "index.json"
+
+COMPONENT_LIST = TypeAdapter(List[schemas.ComponentResponse])
+CATEGORY_LIST = TypeAdapter(List[schemas.CategoryResponse])
+CATEGORY_COUNT_LIST = TypeAdapter(List[schemas.CategoryWithCountResponse])
+DETAIL_VARIANTS = {
+    INDEX_NAME: TypeAdapter(schemas.ComponentWithSnippetsResponse),
+    "summary.json": TypeAdapter(schemas.ComponentSummaryResponse),
+    "html.json": TypeAdapter(schemas.ComponentHighlightedResponse),
+}
+VERSION = TypeAdapter(schemas.CatalogVersionResponse)
+
+
+def encode(adapter: TypeAdapter, content) -> bytes:
+    """Validate content against the route's response model and encode it as the API would"""
+    return adapter.dump_json(adapter.validate_python(content))
+
+
+def compressed_variants(body: bytes) -> Dict[str, bytes]:
+    variants = {".gz": gzip.compress(body, compresslevel=SNAPSHOT_GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(body, quality=SNAPSHOT_BROTLI_QUALITY)
+    return variants
+
+
+class SnapshotWriter:
+    """Writes files under a root atomically, skipping those whose content is unchanged"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def path(self, *parts) -> str:
+        return os.path.join(self.root, *parts)
+
+    def write(self, relative: str, body: bytes):
+        path = self.path(relative)
+        try:
+            with open(path, "rb") as existing:
+                if existing.read() == body:
+                    self.unchanged += 1
+                    return
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Compressed siblings first, so a reader never sees new JSON next to stale .gz/.br files
+        for suffix, compressed in compressed_variants(body).items():
+            self.replace(path + suffix, compressed)
+        self.replace(path, body)
+        self.written += 1
+
+    def replace(self, path: str, body: bytes):
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(body)
+        os.replace(temporary, path)
+
+    def remove_tree(self, relative: str):
+        path = self.path(relative)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+            self.removed += 1
+
+    def remove_stale(self, relative_dir: str, keep: Iterable[str]):
+        """Delete JSON files (and their compressed copies) in a directory that are not in keep"""
+        directory = self.path(relative_dir)
+        if not os.path.isdir(directory):
+            return
+        keep = set(keep)
+        for name in os.listdir(directory):
+            if name.endswith(".json") and name not in keep:
+                for suffix in ("", ".gz", ".br"):
+                    if os.path.exists(os.path.join(directory, name + suffix)):
+                        os.remove(os.path.join(directory, name + suffix))
+                self.removed += 1
+
+
+def load_manifest(root: str) -> dict:
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def listing_rows(session: Session) -> List[dict]:
+    """Every component as the listing endpoints return it, ordered by id"""
+    rows = session.execute(
+        select(
+            Component.id,
+            Component.title,
+            Component.use_case,
+            Component.category_id,
+            Category.name.label("category"),
+            Component.created_at,
+            Component.updated_at
+        )
+        .join(Category, Component.category_id == Category.id)
+        .order_by(Component.id)
+    ).all()
+    return [row._asdict() for row in rows]
+
+
+def listing_item(row: dict) -> dict:
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "use_case": row["use_case"],
+        "category": row["category"].value,
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"]
+    }
+
+
+def write_listings(writer: SnapshotWriter, session: Session, rows: List[dict], page_size: int):
+    """Categories, paged component views and per-category listings"""
+    categories = session.execute(select(Category).order_by(Category.id)).scalars().all()
+    counts = dict(
+        session.execute(
+            select(Component.category_id, func.count(Component.id)).group_by(Component.category_id)
+        ).all()
+    )
+    writer.write("api/categories/index.json", encode(CATEGORY_LIST, [
+        {"id": c.id, "name": c.name.value} for c in categories
+    ]))
+    writer.write("api/categories/counts.json", encode(CATEGORY_COUNT_LIST, [
+        {"id": c.id, "name": c.name.value, "component_count": counts.get(c.id, 0)} for c in categories
+    ]))
+
+    items = [listing_item(row) for row in rows]
+    # Page until a short page, as a client following the API's cursors would; a full
+    # last page is followed by an empty one, just as its X-Next-Cursor leads to []
+    skip_pages, cursor_pages = [], []
+    start = 0
+    while True:
+        page = encode(COMPONENT_LIST, items[start:start + page_size])
+        skip_pages.append(f"{start}.json")
+        writer.write(f"api/components/skip/{start}.json", page)
+        if start == 0:
+            writer.write("api/components/index.json", page)
+        else:
+            cursor = encode_cursor(items[start - 1]["id"])
+            cursor_pages.append(f"{cursor}.json")
+            writer.write(f"api/components/cursor/{cursor}.json", page)
+        if len(items) - start < page_size:
+            break
+        start += page_size
+    writer.remove_stale("api/components/skip", skip_pages)
+    writer.remove_stale("api/components/cursor", cursor_pages)
+
+    for category in categories:
+        listing = [item for item, row in zip(items, rows) if row["category_id"] == category.id]
+        writer.write(f"api/categories/{category.name.name}/components/index.json", encode(COMPONENT_LIST, listing))
+
+
+def stored_highlights(session: Session, snippets) -> dict:
+    hashes = {s.content_hash for s in snippets}
+    if not hashes:
+        return {}
+    rows = session.execute(
+        select(SnippetHighlight.content_hash, SnippetHighlight.language, SnippetHighlight.html)
+        .where(SnippetHighlight.content_hash.in_(hashes))
+    ).all()
+    return {(row.content_hash, row.language): row.html for row in rows}
+
+
+def detail_documents(component, highlights: dict) -> Dict[str, dict]:
+    """The full, fields=summary and render=html bodies of a component detail"""
+    base = {
+        "id": component.id,
+        "title": component.title,
+        "use_case": component.use_case,
+        "category": component.category.name.value,
+        "created_at": component.created_at,
+        "updated_at": component.updated_at
+    }
+    full = [
+        {
+            "id": s.id,
+            "filename": s.filename,
+            "language": s.language,
+            "code": s.code,
+            "created_at": s.created_at
+        }
+        for s in component.snippets
+    ]
+    summary = [
+        {
+            "id": s.id,
+            "filename": s.filename,
+            "language": s.language,
+            "byte_size": s.byte_size,
+            "line_count": s.line_count,
+            "content_hash": s.content_hash,
+            "created_at": s.created_at
+        }
+        for s in component.snippets
+    ]
+    highlighted = [
+        {
+            **snippet,
+            "html": highlights.get((s.content_hash, language_key(s.language)))
+            or highlight_html(s.code, s.language)
+        }
+        for snippet, s in zip(full, component.snippets)
+    ]
+    return {
+        INDEX_NAME: {**base, "snippets": full},
+        "summary.json": {**base, "snippets": summary},
+        "html.json": {**base, "snippets": highlighted},
+    }
+
+
+def write_details(writer: SnapshotWriter, session: Session, component_ids: List[int], batch_size: int):
+    for start in range(0, len(component_ids), batch_size):
+        components = session.execute(
+            select(Component)
+            .options(joinedload(Component.category), selectinload(Component.snippets))
+            .where(Component.id.in_(component_ids[start:start + batch_size]))
+        ).scalars().all()
+        highlights = stored_highlights(session, [s for c in components for s in c.snippets])
+        for component in components:
+            for name, document in detail_documents(component, highlights).items():
+                writer.write(f"api/components/{component.id}/{name}", encode(DETAIL_VARIANTS[name], document))
+        # Keep memory flat across large catalogs
+        session.expunge_all()
+
+
+def remove_deleted_details(writer: SnapshotWriter, current: dict):
+    """Drop detail directories of components that no longer exist"""
+    directory = writer.path("api/components")
+    for name in os.listdir(directory) if os.path.isdir(directory) else ():
+        if name.isdigit() and name not in current:
+            writer.remove_tree(f"api/components/{name}")
+
+
+def build_snapshot(
+    engine,
+    root: str = SNAPSHOT_DIR,
+    full: bool = False,
+    page_size: int = SNAPSHOT_PAGE_SIZE,
+    batch_size: int = DETAIL_BATCH_SIZE
+) -> dict:
+    """Bring the snapshot under root up to date with the database, returning what changed"""
+    if not category_ids():
+        load_categories(engine)
+    manifest = {} if full else load_manifest(root)
+    writer = SnapshotWriter(root)
+    os.makedirs(root, exist_ok=True)
+
+    with Session(engine) as session:
+        # One read transaction, so every file reflects the same catalog version
+        with session.begin():
+            version, version_updated_at = session.execute(catalog_version_query()).one()
+            if manifest.get("catalog_version") == version and manifest.get("page_size") == page_size:
+                return {"catalog_version": version, "details": 0, "written": 0, "unchanged": 0, "removed": 0}
+
+            rows = listing_rows(session)
+            previous = manifest.get("components", {})
+            current = {str(row["id"]): row["updated_at"].isoformat() for row in rows}
+            changed = [int(i) for i, stamp in current.items() if previous.get(i) != stamp]
+
+            write_details(writer, session, changed, batch_size)
+            remove_deleted_details(writer, current)
+            write_listings(writer, session, rows, page_size)
+            writer.write("api/catalog/version/index.json", encode(VERSION, {
+                "version": version, "updated_at": version_updated_at
+            }))
+
+    # Written last: an interrupted run is redone from the previous manifest
+    writer.replace(writer.path(MANIFEST_NAME), json.dumps({
+        "catalog_version": version,
+        "page_size": page_size,
+        "generated_at": datetime.utcnow().isoformat(),
+        "components": current
+    }).encode())
+    return {
+        "catalog_version": version,
+        "details": len(changed),
+        "written": writer.written,
+        "unchanged": writer.unchanged,
+        "removed": writer.removed
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Render the public catalog API to static precompressed JSON")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="snapshot root directory")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every component")
+    args = parser.parse_args(argv)
+
+    from database import engine
+
+    result = build_snapshot(engine, args.out, full=args.full)
+    print(
+        f"catalog version {result['catalog_version']}: {result['details']} components rebuilt, "
+        f"{result['written']} files written, {result['unchanged']} unchanged, {result['removed']} removed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import hashlib
+import re
+from typing import Optional, Tuple
+
+# Chunk size used when streaming raw snippet bodies
+RAW_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be served for the snippet's size"""
+
+
+def snippet_metadata(code: str) -> dict:
+    """Size, line count and content hash stored alongside each snippet"""
+    encoded = code.encode("utf-8")
+    line_count = code.count("\n")
+    if code and not code.endswith("\n"):
+        line_count += 1
+    return {
+        "byte_size": len(encoded),
+        "line_count": line_count,
+        "content_hash": hashlib.sha256(encoded).hexdigest()
+    }
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Resolve a single bytes Range header to an inclusive (start, end), or None for the whole body"""
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        # Multiple or malformed ranges are ignored and the full body is sent
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def iter_chunks(data: bytes, chunk_size: int = RAW_CHUNK_SIZE):
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
@@ -35,7 +35,8 @@ from fastapi.testclient import TestClient
 os.environ['FOUNDRY_DATABASE_URL'] = 'sqlite:///./test_foundry.db'
 
 from server.database import Base, get_db
-from server.model import Admin, Category, Component, CodeSnippet
+from server.model import Admin, Category, Component, CodeSnippet, SnippetBlob
+from server.snippets import snippet_metadata
 from server.routers.auth import pwd_context
 import server.main as main_module
 
@@ -137,11 +138,20 @@ def test_component(test_category):
 
 @pytest.fixture
 def test_snippet(test_component):
+    code = "export const Button = () => <button />"
+    metadata = snippet_metadata(code)
+    blob = SnippetBlob(
+        content_hash=metadata["content_hash"],
+        code=code,
+        byte_size=metadata["byte_size"],
+        ref_count=1,
+    )
     snippet = CodeSnippet(
         filename="Button.tsx",
         language="tsx",
-        code="export const Button = () => <button />",
         component_id=test_component.id,
+        blob=blob,
+        **metadata,
     )
     db = TestingSessionLocal()
     db.add(snippet)
@@ -150,4 +160,5 @@ def test_snippet(test_component):
     yield snippet
     with engine.connect() as conn:
         conn.execute(text("DELETE FROM code_snippets"))
+        conn.execute(text("DELETE FROM snippet_blobs"))
         conn.commit()
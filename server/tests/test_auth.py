@@ -41,3 +41,48 @@ def test_admin_login_success(client):
 
     assert response.status_code == 200
     assert "access_token" in response.json()
+
+
+def signup_and_login(client, username):
+    client.post("/api/auth/signup", json={
+        "username": username,
+        "email": f"{username}@admin.com",
+        "password": "CachePass1"
+    })
+    response = client.post(
+        "/api/auth/login",
+        data={"username": username, "password": "CachePass1"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    return response.json()["access_token"]
+
+
+def test_authenticated_requests_skip_admin_lookup(client):
+    from tests.test_query_counts import count_queries
+
+    token = signup_and_login(client, f"cached_{uuid.uuid4().hex[:8]}")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/auth/admin", headers=headers)
+
+    with count_queries() as statements:
+        response = client.get("/api/auth/admin", headers=headers)
+
+    assert response.status_code == 200
+    assert not any("FROM admins" in s for s in statements)
+
+
+def test_deleted_admin_is_rejected_immediately(client):
+    from database import SessionLocal
+    from model import Admin
+
+    username = f"gone_{uuid.uuid4().hex[:8]}"
+    token = signup_and_login(client, username)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/admin", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    db.delete(db.query(Admin).filter(Admin.username == username).first())
+    db.commit()
+    db.close()
+
+    assert client.get("/api/auth/admin", headers=headers).status_code == 401
@@ -0,0 +1,63 @@
+from cache import response_cache
+from tests.test_query_counts import count_queries
+from tests.test_snippets import MANIFEST, create_component_with_snippet
+
+
+def test_batch_returns_components_in_request_order(client, admin_token):
+    first, _ = create_component_with_snippet(client, admin_token)
+    second, _ = create_component_with_snippet(client, admin_token)
+
+    response = client.get(f"/api/components/batch?ids={second},999999,{first},{second}")
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["id"] for c in body["components"]] == [second, first]
+    assert body["missing"] == [999999]
+    assert body["components"][0] == client.get(f"/api/components/{second}").json()
+    assert body["components"][1]["snippets"][0]["code"] == MANIFEST
+
+
+def test_batch_uses_constant_queries(client, admin_token):
+    ids = [create_component_with_snippet(client, admin_token)[0] for _ in range(5)]
+
+    response_cache.clear()
+    with count_queries() as single:
+        client.get(f"/api/components/batch?ids={ids[0]}")
+    response_cache.clear()
+    with count_queries() as batched:
+        many = client.get(f"/api/components/batch?ids={','.join(map(str, ids))}")
+    assert len(many.json()["components"]) == 5
+    assert len(batched) == len(single)
+
+
+def test_batch_supports_conditional_requests(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    url = f"/api/components/batch?ids={component_id}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    client.put(f"/api/admin/components/{component_id}", json={"title": "Batched"}, headers=headers)
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["components"][0]["title"] == "Batched"
+
+
+def test_batch_rejects_bad_ids(client):
+    assert client.get("/api/components/batch?ids=1,two").status_code == 400
+    assert client.get("/api/components/batch?ids=").status_code == 400
+    too_many = ",".join(str(i) for i in range(1, 102))
+    assert client.get(f"/api/components/batch?ids={too_many}").status_code == 400
+
+
+def test_batch_caps_distinct_ids(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    repeated = ",".join([str(component_id)] * 150)
+    response = client.get(f"/api/components/batch?ids={repeated}")
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["components"]] == [component_id]
+
+
+def test_batch_rejects_out_of_range_ids(client):
+    assert client.get("/api/components/batch?ids=99999999999999999999").status_code == 422
+    assert client.get(f"/api/components/batch?ids=1,{-2 ** 63 - 1}").status_code == 422
+    assert client.get(f"/api/components/batch?ids={2 ** 63 - 1}").json()["missing"] == [2 ** 63 - 1]
@@ -0,0 +1,42 @@
+from benchmarks.suite import compare, percentile
+
+
+def result(**overrides):
+    base = {
+        "mode": "in_process",
+        "scenario": "component_detail",
+        "concurrency": 8,
+        "requests": 100,
+        "errors": 0,
+        "throughput_rps": 100.0,
+        "p50_ms": 5.0,
+        "p95_ms": 10.0,
+        "p99_ms": 20.0,
+        "queries_per_request": 2.0,
+    }
+    return {**base, **overrides}
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.50) == 50
+    assert percentile(samples, 0.99) == 99
+    assert percentile([], 0.95) == 0.0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = [result()]
+
+    assert compare([result(throughput_rps=95.0, p95_ms=10.5)], baseline, tolerance=0.15) == []
+
+    regressions = compare(
+        [result(throughput_rps=50.0, p95_ms=30.0, queries_per_request=3.0)],
+        baseline,
+        tolerance=0.15
+    )
+    assert len(regressions) == 3
+    assert all(r.startswith("in_process/component_detail/8") for r in regressions)
+
+
+def test_compare_ignores_unmatched_results():
+    assert compare([result(concurrency=64, throughput_rps=1.0)], [result()], tolerance=0.15) == []
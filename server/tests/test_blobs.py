@@ -0,0 +1,107 @@
+import json
+import uuid
+
+from sqlalchemy import create_engine, inspect, text
+
+from database import engine
+from migrations import migrate
+from snippets import snippet_metadata
+from tests.test_snippets import create_component_with_snippet
+
+
+def blob_refs(content_hash):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT ref_count FROM snippet_blobs WHERE content_hash = :h"), {"h": content_hash}
+        ).scalar()
+
+
+def test_identical_bodies_share_one_blob(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    code = f"FROM python:3.11-slim  # {uuid.uuid4().hex}\n"
+    content_hash = snippet_metadata(code)["content_hash"]
+    first_component, first_snippet = create_component_with_snippet(client, admin_token, code=code)
+    second_component, second_snippet = create_component_with_snippet(client, admin_token, code=code)
+    assert blob_refs(content_hash) == 2
+
+    first = client.get(f"/api/snippets/{first_snippet}/raw")
+    second = client.get(f"/api/snippets/{second_snippet}/raw")
+    assert first.text == second.text == code
+    assert first.headers["etag"] == second.headers["etag"] == f'"{content_hash}"'
+    assert client.get(f"/api/components/{second_component}").json()["snippets"][0]["code"] == code
+
+    assert client.delete(f"/api/admin/snippets/{first_snippet}", headers=headers).status_code == 204
+    assert blob_refs(content_hash) == 1
+    assert client.get(f"/api/snippets/{second_snippet}/raw").text == code
+
+    assert client.delete(f"/api/admin/components/{second_component}", headers=headers).status_code == 204
+    assert blob_refs(content_hash) is None
+    client.delete(f"/api/admin/components/{first_component}", headers=headers)
+
+
+def test_update_moves_reference_and_reindexes(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    old_word, new_word = f"old{uuid.uuid4().hex[:8]}", f"new{uuid.uuid4().hex[:8]}"
+    _, snippet_id = create_component_with_snippet(client, admin_token, code=f"{old_word}\n")
+
+    response = client.put(
+        f"/api/admin/snippets/{snippet_id}", json={"code": f"{new_word}\n"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["code"] == f"{new_word}\n"
+    assert blob_refs(snippet_metadata(f"{old_word}\n")["content_hash"]) is None
+    assert blob_refs(snippet_metadata(f"{new_word}\n")["content_hash"]) == 1
+
+    assert client.get(f"/api/search?q={old_word}").json() == []
+    assert [r["snippet_id"] for r in client.get(f"/api/search?q={new_word}").json()] == [snippet_id]
+
+
+def test_import_deduplicates_bodies(client, admin_token):
+    code = f"tsconfig {uuid.uuid4().hex}\n"
+    rows = [
+        {
+            "title": f"Deduplicated {i}",
+            "use_case": "Component sharing a config file",
+            "category": "frontend",
+            "snippets": [{"filename": "tsconfig.json", "language": "json", "code": code}]
+        }
+        for i in range(3)
+    ]
+    response = client.post(
+        "/api/admin/import?batch_size=2",
+        content="\n".join(json.dumps(row) for row in rows),
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.json()["snippets"] == 3
+    assert blob_refs(snippet_metadata(code)["content_hash"]) == 3
+
+
+def test_storage_report(client, admin_token):
+    create_component_with_snippet(client, admin_token)
+    create_component_with_snippet(client, admin_token)
+    report = client.get("/api/admin/storage", headers={"Authorization": f"Bearer {admin_token}"}).json()
+    assert report["blobs"] < report["snippets"]
+    assert report["saved_bytes"] == report["logical_bytes"] - report["stored_bytes"] > 0
+
+
+def test_migration_moves_bodies_into_blobs(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE code_snippets (id INTEGER PRIMARY KEY, filename VARCHAR(255), "
+            "language VARCHAR(50), code TEXT, component_id INTEGER, created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO code_snippets (filename, language, code, component_id) VALUES "
+            "('Dockerfile', 'dockerfile', 'FROM alpine\n', 1), "
+            "('Dockerfile', 'dockerfile', 'FROM alpine\n', 2), "
+            "('main.py', 'python', 'print()\n', 2)"
+        ))
+
+    assert "snippet_blobs" in migrate(legacy)
+
+    assert "code" not in {c["name"] for c in inspect(legacy).get_columns("code_snippets")}
+    with legacy.connect() as conn:
+        blobs = conn.execute(text("SELECT code, ref_count FROM snippet_blobs ORDER BY code")).all()
+    assert [tuple(b) for b in blobs] == [("FROM alpine\n", 2), ("print()\n", 1)]
+    legacy.dispose()
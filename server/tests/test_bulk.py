@@ -0,0 +1,111 @@
+import json
+import uuid
+
+from tests.test_query_counts import count_queries
+
+
+def ndjson(*rows):
+    return "\n".join(r if isinstance(r, str) else json.dumps(r) for r in rows) + "\n"
+
+
+def test_import_reports_row_errors_and_loads_valid_rows(client, admin_token):
+    tag = uuid.uuid4().hex[:8]
+    body = ndjson(
+        {
+            "title": f"Imported Queue {tag}",
+            "use_case": "Background job queue imported in bulk",
+            "category": "backend",
+            "snippets": [{"filename": "queue.py", "language": "python", "code": "queue = []"}]
+        },
+        "{not json",
+        {"title": "x", "use_case": "too short", "category": "backend"},
+        {"title": f"Imported Grid {tag}", "use_case": "Responsive grid imported in bulk", "category": "frontend"}
+    )
+
+    response = client.post(
+        "/api/admin/import?batch_size=1",
+        content=body,
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["components"] == 2
+    assert result["snippets"] == 1
+    assert [e["line"] for e in result["errors"]] == [2, 3]
+    assert "title" in result["errors"][1]["error"]
+
+    listing = client.get("/api/categories/frontend/components").json()
+    assert f"Imported Grid {tag}" in [c["title"] for c in listing]
+
+
+def test_import_attaches_snippets_to_their_own_rows(client, admin_token):
+    tag = uuid.uuid4().hex[:8]
+    rows = [
+        {
+            "title": f"Matched {tag} {i}",
+            "use_case": "Row whose snippet must stay with it",
+            "category": "backend",
+            "snippets": [{"filename": f"row{i}.py", "language": "python", "code": f"row = {i}"}]
+        }
+        for i in range(5)
+    ]
+    client.post("/api/admin/import", content=ndjson(*rows), headers={"Authorization": f"Bearer {admin_token}"})
+
+    listing = client.get("/api/categories/backend/components?limit=1000").json()
+    imported = [c for c in listing if c["title"].startswith(f"Matched {tag} ")]
+    assert len(imported) == 5
+    for component in imported:
+        i = component["title"].rsplit(" ", 1)[1]
+        detail = client.get(f"/api/components/{component['id']}").json()
+        assert [s["filename"] for s in detail["snippets"]] == [f"row{i}.py"]
+
+
+def test_import_batches_share_transactions(client, admin_token):
+    rows = [
+        {"title": f"Batched {i}", "use_case": "Row loaded as part of a batch", "category": "devops"}
+        for i in range(20)
+    ]
+
+    with count_queries() as queries:
+        response = client.post(
+            "/api/admin/import?batch_size=10",
+            content=ndjson(*rows),
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.json()["components"] == 20
+    assert len([q for q in queries if q.lstrip().upper().startswith("INSERT INTO COMPONENTS")]) <= 2
+
+
+def test_export_streams_importable_rows(client, admin_token):
+    tag = uuid.uuid4().hex[:8]
+    client.post(
+        "/api/admin/import",
+        content=ndjson({
+            "title": f"Exported Cache {tag}",
+            "use_case": "Cache layer that should appear in the export",
+            "category": "database",
+            "snippets": [{"filename": "cache.sql", "language": "sql", "code": "SELECT 1;"}]
+        }),
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    response = client.get(
+        "/api/admin/export?batch_size=3",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ids = [row["id"] for row in rows]
+    assert ids == sorted(ids)
+    exported = next(row for row in rows if row["title"] == f"Exported Cache {tag}")
+    assert exported["category"] == "database"
+    assert exported["snippets"][0]["code"] == "SELECT 1;"
+
+
+def test_bulk_endpoints_require_admin(client):
+    assert client.post("/api/admin/import", content="{}").status_code == 401
+    assert client.get("/api/admin/export").status_code == 401
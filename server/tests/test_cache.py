@@ -0,0 +1,131 @@
+from cache import TTLCache, ResponseCache, response_cache, component_tag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    clock.now = 6
+    assert cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_response_cache_invalidates_only_tagged_keys():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set("detail-1", {"id": 1}, tags=(component_tag(1),))
+    cache.set("detail-2", {"id": 2}, tags=(component_tag(2),))
+
+    cache.invalidate(component_tag(1))
+
+    assert cache.get("detail-1") is None
+    assert cache.get("detail-2") == {"id": 2}
+
+
+def test_response_cache_skips_results_read_before_an_invalidation():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    generation = cache.generation
+    # A write commits and invalidates while the reader is still querying
+    cache.invalidate("component:1")
+    cache.set("detail:1", "stale", tags=("component:1",), generation=generation)
+    assert cache.get("detail:1") is None
+    assert cache.stats()["stale_writes"] == 1
+
+    cache.set("detail:1", "fresh", tags=("component:1",), generation=cache.generation)
+    assert cache.get("detail:1") == "fresh"
+
+
+def test_public_detail_is_cached_and_invalidated_by_snippet_write(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    create = client.post(
+        "/api/admin/components",
+        json={
+            "title": "Cached Component",
+            "use_case": "Component used to exercise the response cache",
+            "category": "backend"
+        },
+        headers=headers
+    )
+    component_id = create.json()["id"]
+
+    client.get(f"/api/components/{component_id}")
+    hits_before = response_cache.stats()["hits"]
+    response = client.get(f"/api/components/{component_id}")
+    assert response.status_code == 200
+    assert response_cache.stats()["hits"] == hits_before + 1
+    assert response.json()["snippets"] == []
+
+    client.post(
+        f"/api/admin/components/{component_id}/snippets",
+        json={"filename": "main.py", "language": "python", "code": "print('hi')"},
+        headers=headers
+    )
+
+    response = client.get(f"/api/components/{component_id}")
+    assert [s["filename"] for s in response.json()["snippets"]] == ["main.py"]
+
+
+def test_snippet_write_invalidates_listings(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    component_id = client.post(
+        "/api/admin/components",
+        json={
+            "title": "Listed Component",
+            "use_case": "Component whose snippets change its listing entry",
+            "category": "database"
+        },
+        headers=headers
+    ).json()["id"]
+
+    def listed(url):
+        response = client.get(url)
+        return response, next(c for c in response.json() if c["id"] == component_id)
+
+    listing, before = listed("/api/components?limit=1000")
+    category_listing, category_before = listed("/api/categories/database/components")
+
+    client.post(
+        f"/api/admin/components/{component_id}/snippets",
+        json={"filename": "schema.sql", "language": "sql", "code": "SELECT 1;"},
+        headers=headers
+    )
+
+    _, after = listed("/api/components?limit=1000")
+    _, category_after = listed("/api/categories/database/components")
+    assert after["updated_at"] > before["updated_at"]
+    assert category_after["updated_at"] > category_before["updated_at"]
+    for url, response in (("/api/components?limit=1000", listing), ("/api/categories/database/components", category_listing)):
+        assert client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+
+def test_admin_stats_exposes_cache_counters(client, admin_token):
+    response = client.get(
+        "/api/admin/stats",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_rate"} <= response.json()["cache"].keys()
@@ -0,0 +1,99 @@
+import asyncio
+import gzip
+import json
+
+from compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+    compression_stats,
+    compressed_cache,
+)
+from tests.test_snippets import create_component_with_snippet
+
+LARGE_CODE = "resource \"aws_s3_bucket\" \"logs\" {\n  bucket = \"foundry-logs\"\n}\n" * 200
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("br;q=0, gzip", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("*", ("br", "gzip")) == "br"
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+    assert negotiate_encoding("", ("gzip",)) is None
+
+
+def test_detail_is_gzipped_and_reused(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token, code=LARGE_CODE)
+    compressed_cache.clear()
+
+    first = client.get(f"/api/components/{component_id}", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert int(first.headers["content-length"]) < len(LARGE_CODE) / 4
+    assert first.json()["snippets"][0]["code"] == LARGE_CODE
+
+    served_before = compression_stats.snapshot()["served_from_cache"]
+    second = client.get(f"/api/components/{component_id}", headers={"Accept-Encoding": "gzip"})
+    assert second.json() == first.json()
+    assert compression_stats.snapshot()["served_from_cache"] == served_before + 1
+
+
+def test_brotli_is_preferred_when_accepted(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token, code=LARGE_CODE)
+
+    response = client.get(f"/api/components/{component_id}", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["snippets"][0]["code"] == LARGE_CODE
+
+
+def test_small_and_ranged_responses_are_not_compressed(client, admin_token):
+    _, snippet_id = create_component_with_snippet(client, admin_token, code=LARGE_CODE)
+
+    health = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+
+    partial = client.get(
+        f"/api/snippets/{snippet_id}/raw",
+        headers={"Accept-Encoding": "gzip", "Range": "bytes=0-99"}
+    )
+    assert partial.status_code == 206
+    assert "content-encoding" not in partial.headers
+    assert partial.content == LARGE_CODE.encode()[:100]
+
+
+def test_streamed_export_is_compressed(client, admin_token):
+    response = client.get(
+        "/api/admin/export?batch_size=2",
+        headers={"Authorization": f"Bearer {admin_token}", "Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert all(json.loads(line)["id"] for line in response.text.splitlines())
+
+
+def test_middleware_compresses_without_an_etag():
+    body = b"[" + b"1, " * 400 + b"1]"
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    middleware = CompressionMiddleware(app, minimum_size=100)
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(middleware(scope, receive, send))
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert int(headers[b"content-length"]) == len(sent[1]["body"])
+    assert gzip.decompress(sent[1]["body"]) == body
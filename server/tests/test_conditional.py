@@ -0,0 +1,95 @@
+from cache import response_cache
+from tests.test_query_counts import count_queries
+from tests.test_snippets import create_component_with_snippet
+
+
+def test_detail_returns_etag_and_last_modified(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+
+    response = client.get(f"/api/components/{component_id}")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+
+
+def test_detail_if_none_match_returns_304(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    etag = client.get(f"/api/components/{component_id}").headers["etag"]
+
+    response = client.get(f"/api/components/{component_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_detail_validator_skips_snippet_bodies(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    etag = client.get(f"/api/components/{component_id}").headers["etag"]
+    response_cache.clear()
+
+    with count_queries() as statements:
+        response = client.get(f"/api/components/{component_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert not any("snippet_blobs.code" in s for s in statements)
+
+
+def test_unconditional_detail_skips_validator_queries(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    response_cache.clear()
+
+    with count_queries() as statements:
+        response = client.get(f"/api/components/{component_id}")
+
+    assert response.status_code == 200
+    assert len(statements) == 2
+    response_cache.clear()
+    assert client.get(
+        f"/api/components/{component_id}", headers={"If-None-Match": response.headers["etag"]}
+    ).status_code == 304
+
+
+def test_snippet_update_changes_detail_etag(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    detail = client.get(f"/api/components/{component_id}")
+    snippet_id = detail.json()["snippets"][0]["id"]
+
+    client.put(
+        f"/api/admin/snippets/{snippet_id}",
+        json={"code": "export const value = 1"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    response = client.get(
+        f"/api/components/{component_id}",
+        headers={"If-None-Match": detail.headers["etag"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["snippets"][0]["code"] == "export const value = 1"
+
+
+def test_list_validates_by_etag_only(client, admin_token):
+    create_component_with_snippet(client, admin_token)
+    listing = client.get("/api/components?limit=1000")
+    assert "last-modified" not in listing.headers
+
+    response = client.get("/api/components?limit=1000", headers={"If-None-Match": listing.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_list_changes_after_delete(client, admin_token):
+    doomed, _ = create_component_with_snippet(client, admin_token)
+    listing = client.get("/api/components?limit=1000")
+
+    client.delete(f"/api/admin/components/{doomed}", headers={"Authorization": f"Bearer {admin_token}"})
+    response = client.get(
+        "/api/components?limit=1000",
+        headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+    assert doomed not in [c["id"] for c in response.json()]
+    assert client.get(
+        "/api/components?limit=1000", headers={"If-None-Match": listing.headers["etag"]}
+    ).status_code == 200
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from database import (
+    sqlite_pragma_statements,
+    install_sqlite_pragmas,
+    SQLITE_PRAGMAS,
+    engine_options,
+    create_database_engine,
+)
+from pooling import PoolMetrics
+
+
+def test_pragmas_are_applied_to_every_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    install_sqlite_pragmas(engine, SQLITE_PRAGMAS)
+    try:
+        for _ in range(2):
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            engine.dispose()
+    finally:
+        engine.dispose()
+
+
+def test_empty_values_keep_sqlite_defaults():
+    statements = sqlite_pragma_statements({"journal_mode": "", "busy_timeout": "250", "temp_store": "memory"})
+    assert statements == ["PRAGMA busy_timeout=250", "PRAGMA temp_store=MEMORY"]
+
+
+@pytest.mark.parametrize("pragmas", [
+    {"journal_mode": "WAL; DROP TABLE admins"},
+    {"synchronous": "SOMETIMES"},
+    {"mmap_size": "lots"},
+])
+def test_invalid_values_are_rejected(pragmas):
+    with pytest.raises(ValueError):
+        sqlite_pragma_statements(pragmas)
+
+
+def test_engine_options_follow_the_dialect():
+    sqlite_options = engine_options("sqlite:///./example.db")
+    assert sqlite_options["connect_args"] == {"check_same_thread": False}
+    assert sqlite_options["pool_pre_ping"] is False
+    assert "pool_size" in sqlite_options
+
+    memory_options = engine_options("sqlite://")
+    assert "pool_size" not in memory_options
+
+    postgres_options = engine_options("postgresql+asyncpg://user:secret@db/foundry")
+    assert "check_same_thread" not in postgres_options.get("connect_args", {})
+    assert postgres_options["pool_pre_ping"] is True
+
+
+def test_pool_metrics_record_checkout_waits(tmp_path):
+    metrics = PoolMetrics()
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'pooled.db'}", metrics)
+    try:
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        stats = metrics.stats()
+        assert stats["pool"] == "QueuePool"
+        assert stats["checkouts"] == 3
+        assert stats["checked_out"] == 0
+    finally:
+        engine.dispose()
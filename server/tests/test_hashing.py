@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from hashing import PasswordHasher, HashQueueFull
+
+
+class BlockingContext:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password):
+        self.release.wait(5)
+        return f"hashed:{password}"
+
+    def verify(self, password, hashed_password):
+        return hashed_password == f"hashed:{password}"
+
+
+def test_hash_and_verify_run_off_the_event_loop():
+    hasher = PasswordHasher(BlockingContext(), workers=1, max_pending=4)
+    hasher.context.release.set()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        hashed = await hasher.hash("Secret123")
+        assert threading.get_ident() == loop_thread
+        return hashed, await hasher.verify("Secret123", hashed)
+
+    hashed, verified = asyncio.run(run())
+
+    assert hashed == "hashed:Secret123"
+    assert verified is True
+    assert hasher.stats()["completed"] == 2
+
+
+def test_excess_hash_requests_are_shed():
+    hasher = PasswordHasher(BlockingContext(), workers=1, max_pending=2)
+
+    async def run():
+        first = asyncio.create_task(hasher.hash("a"))
+        second = asyncio.create_task(hasher.hash("b"))
+        await asyncio.sleep(0.05)
+        assert hasher.stats()["queue_depth"] == 2
+        with pytest.raises(HashQueueFull):
+            await hasher.hash("c")
+        hasher.context.release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 2
+
+
+def test_cancelled_callers_keep_running_jobs_counted():
+    hasher = PasswordHasher(BlockingContext(), workers=1, max_pending=2)
+
+    async def run():
+        running = asyncio.create_task(hasher.hash("a"))
+        queued = asyncio.create_task(hasher.hash("b"))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+        # The queued job never starts, but the running one still occupies a worker
+        assert hasher.stats()["queue_depth"] == 1
+        hasher.context.release.set()
+        for _ in range(100):
+            if hasher.stats()["queue_depth"] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    stats = hasher.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] == 1
+
+
+def test_login_sheds_load_when_hash_queue_is_full(client, admin_token, monkeypatch):
+    from routers.auth import password_hasher
+
+    async def overloaded(*args):
+        raise HashQueueFull()
+
+    monkeypatch.setattr(password_hasher, "verify", overloaded)
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "testadmin", "password": "TestPass123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,92 @@
+import uuid
+
+from sqlalchemy import text
+
+import highlighting
+from database import engine
+from highlighting import backfill, highlight_html
+from snippets import snippet_metadata
+from tests.test_snippets import create_component_with_snippet
+
+
+def stored_html(content_hash, language):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT html FROM snippet_highlights WHERE content_hash = :h AND language = :l"),
+            {"h": content_hash, "l": language}
+        ).scalar()
+
+
+def test_highlight_html_escapes_and_falls_back():
+    assert '<span class="k">def</span>' in highlight_html("def f(): pass\n", "Python")
+    assert highlight_html("<b>\n", "not-a-language") == "&lt;b&gt;\n"
+
+
+def test_create_stores_highlight_served_with_render_html(client, admin_token):
+    code = f"name: {uuid.uuid4().hex}\n"
+    component_id, snippet_id = create_component_with_snippet(client, admin_token, code=code)
+    html = stored_html(snippet_metadata(code)["content_hash"], "yaml")
+    assert '<span class="' in html
+
+    plain = client.get(f"/api/components/{component_id}")
+    highlighted = client.get(f"/api/components/{component_id}?render=html")
+    assert highlighted.status_code == 200
+    assert "html" not in plain.json()["snippets"][0]
+    snippet = highlighted.json()["snippets"][0]
+    assert snippet["id"] == snippet_id
+    assert snippet["code"] == code
+    assert snippet["html"] == html
+    assert highlighted.headers["etag"] != plain.headers["etag"]
+
+
+def test_update_renders_new_language(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    code = f"print('{uuid.uuid4().hex}')\n"
+    component_id, snippet_id = create_component_with_snippet(client, admin_token, code=code)
+    content_hash = snippet_metadata(code)["content_hash"]
+    assert stored_html(content_hash, "python") is None
+
+    response = client.put(f"/api/admin/snippets/{snippet_id}", json={"language": "Python"}, headers=headers)
+    assert response.status_code == 200
+    assert '<span class="nb">print</span>' in stored_html(content_hash, "python")
+    html = client.get(f"/api/components/{component_id}?render=html").json()["snippets"][0]["html"]
+    assert '<span class="nb">print</span>' in html
+
+
+def test_known_pairs_are_not_rendered_again(client, admin_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    code = f"name: {uuid.uuid4().hex}\n"
+    _, snippet_id = create_component_with_snippet(client, admin_token, code=code)
+
+    rendered = []
+    monkeypatch.setattr(highlighting, "highlight_html", lambda code, language: rendered.append(language) or "")
+    # Same body and language under another component, then edits that keep both
+    create_component_with_snippet(client, admin_token, code=code)
+    client.put(f"/api/admin/snippets/{snippet_id}", json={"filename": "renamed.yaml"}, headers=headers)
+    client.put(f"/api/admin/snippets/{snippet_id}", json={"language": "YAML", "code": code}, headers=headers)
+    assert rendered == []
+
+    client.put(f"/api/admin/snippets/{snippet_id}", json={"language": "text"}, headers=headers)
+    assert rendered == ["text"]
+
+
+def test_backfill_renders_missing_pairs(client, admin_token):
+    code = f"key: {uuid.uuid4().hex}\n"
+    component_id, _ = create_component_with_snippet(client, admin_token, code=code)
+    content_hash = snippet_metadata(code)["content_hash"]
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM snippet_highlights WHERE content_hash = :h"), {"h": content_hash})
+
+    # Served from an on-the-fly render until the backfill stores it
+    html = client.get(f"/api/components/{component_id}?render=html").json()["snippets"][0]["html"]
+    assert stored_html(content_hash, "yaml") is None
+
+    assert backfill(engine) >= 1
+    assert stored_html(content_hash, "yaml") == html
+    assert backfill(engine) == 0
+
+
+def test_render_html_rejects_summary(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    response = client.get(f"/api/components/{component_id}?fields=summary&render=html")
+    assert response.status_code == 400
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+
+from migrations import migrate, MIGRATIONS
+from model import Category, Component, CodeSnippet
+from pagination import encode_cursor, paginate
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexed.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_fresh_database_records_every_migration(migrated_engine):
+    with migrated_engine.connect() as conn:
+        versions = conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars().all()
+    assert versions == [version for version, _, _ in MIGRATIONS]
+    assert migrate(migrated_engine) == []
+
+
+def test_indexes_are_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE components (id INTEGER PRIMARY KEY, title VARCHAR(255), use_case TEXT, "
+            "category_id INTEGER, created_at DATETIME, updated_at DATETIME)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE code_snippets (id INTEGER PRIMARY KEY, filename VARCHAR(255), "
+            "language VARCHAR(50), code TEXT, component_id INTEGER, created_at DATETIME)"
+        ))
+
+    migrate(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("components")}
+    assert "ix_components_category_id_created_at" in indexes
+    assert "ix_components_category_id_id" in indexes
+    snippet_indexes = {index["name"] for index in inspect(engine).get_indexes("code_snippets")}
+    assert "ix_code_snippets_component_id_id" in snippet_indexes
+    engine.dispose()
+
+
+def category_listing_statement(cursor=None):
+    # The statement get_components_by_category hands to paginate()
+    query = (
+        select(
+            Component.id,
+            Component.title,
+            Component.use_case,
+            Category.name.label("category"),
+            Component.created_at,
+            Component.updated_at
+        )
+        .join(Category, Component.category_id == Category.id)
+        .where(Component.category_id == 1)
+    )
+    return paginate(query, Component.id, 0, 100, cursor)
+
+
+@pytest.mark.parametrize("cursor", [None, encode_cursor(5)])
+def test_category_listing_walks_index_in_id_order(migrated_engine, cursor):
+    plan = query_plan(migrated_engine, category_listing_statement(cursor))
+    assert "ix_components_category_id_id" in plan
+    assert "SCAN components" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_snippet_loading_uses_component_index(migrated_engine):
+    statement = (
+        select(CodeSnippet)
+        .where(CodeSnippet.component_id.in_([1, 2, 3]))
+        .order_by(CodeSnippet.component_id, CodeSnippet.id)
+    )
+    plan = query_plan(migrated_engine, statement)
+    assert "ix_code_snippets_component_id_id" in plan
+    assert "SCAN code_snippets" not in plan
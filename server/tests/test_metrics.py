@@ -0,0 +1,76 @@
+import asyncio
+
+from metrics import Counter, Histogram, Registry, MetricsMiddleware, http_requests, UNMATCHED_ROUTE
+
+
+def sample(body, line_prefix):
+    for line in body.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0)))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3.0, "/a")
+
+    body = registry.render()
+    assert "# TYPE demo_seconds histogram" in body
+    assert sample(body, 'demo_seconds_bucket{route="/a",le="0.1"}') == 1
+    assert sample(body, 'demo_seconds_bucket{route="/a",le="1.0"}') == 2
+    assert sample(body, 'demo_seconds_bucket{route="/a",le="+Inf"}') == 3
+    assert sample(body, 'demo_seconds_count{route="/a"}') == 3
+    assert sample(body, 'demo_seconds_sum{route="/a"}') == 3.55
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.register(Counter("demo_total", "Demo", ("path",)))
+    counter.inc('a"b\\c')
+    assert 'demo_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+
+def test_requests_are_labelled_by_route_template(client, admin_token):
+    template = "/api/components/{component_id}"
+    before = http_requests.value("GET", template, "404")
+    client.get("/api/components/999999")
+    client.get("/api/components/999998")
+    assert http_requests.value("GET", template, "404") == before + 2
+    assert http_requests.value("GET", "/api/components/999999", "404") == 0
+
+    client.get("/no/such/path")
+    assert http_requests.value("GET", UNMATCHED_ROUTE, "404") >= 1
+
+
+def test_metrics_endpoint_reports_sql_pool_and_hashing(client, admin_token):
+    client.get("/api/categories")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert sample(body, "foundry_http_requests_in_flight") == 1
+    assert sample(body, "foundry_db_queries_total") > 0
+    assert 'foundry_db_queries_per_request_count{route="/api/categories"}' in body
+    assert sample(body, 'foundry_db_pool_checkouts_total{engine="requests"}') > 0
+    assert sample(body, "foundry_password_hashes_total") > 0
+    assert 'foundry_cache_hits_total{cache="tokens"}' in body
+
+
+def test_middleware_records_server_errors():
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    async def call():
+        scope = {"type": "http", "method": "GET", "path": "/boom", "headers": []}
+        try:
+            await MetricsMiddleware(failing_app)(scope, None, None)
+        except RuntimeError:
+            pass
+
+    before = http_requests.value("GET", UNMATCHED_ROUTE, "500")
+    asyncio.run(call())
+    assert http_requests.value("GET", UNMATCHED_ROUTE, "500") == before + 1
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import HTTPException
+
+from pagination import encode_cursor, decode_cursor
+from tests.test_query_counts import create_components
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_invalid_cursor_returns_400(client):
+    response = client.get("/api/components?cursor=%%%")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("last_id", [2 ** 70, True])
+def test_forged_cursor_returns_400(client, last_id):
+    response = client.get(f"/api/components?cursor={encode_cursor(last_id)}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_cursor_pages_cover_listing_in_order(client, admin_token):
+    create_components(client, admin_token, 5)
+    expected = [c["id"] for c in client.get("/api/components?limit=1000").json()]
+
+    seen = []
+    response = client.get("/api/components?limit=2")
+    while True:
+        seen.extend(c["id"] for c in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/api/components?limit=2&cursor={cursor}")
+
+    assert seen == expected
+    assert seen == sorted(seen)
+
+
+def test_skip_limit_still_supported(client, admin_token):
+    create_components(client, admin_token, 3)
+    everything = client.get("/api/components?limit=1000").json()
+
+    response = client.get("/api/components?skip=1&limit=2")
+
+    assert response.status_code == 200
+    assert response.json() == everything[1:3]
+
+
+def test_admin_list_supports_cursor(client, admin_token):
+    create_components(client, admin_token, 3)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    first = client.get("/api/admin/components?limit=2", headers=headers)
+    cursor = first.headers["x-next-cursor"]
+
+    second = client.get(f"/api/admin/components?limit=2&cursor={cursor}", headers=headers)
+
+    assert second.status_code == 200
+    assert second.json()[0]["id"] > first.json()[-1]["id"]
+
+
+def test_category_listing_pages_by_cursor(client, admin_token):
+    create_components(client, admin_token, 5, category="database")
+    expected = [c["id"] for c in client.get("/api/categories/database/components").json()]
+
+    seen = []
+    response = client.get("/api/categories/database/components?limit=2")
+    while True:
+        assert all(c["category"] == "Database" for c in response.json())
+        seen.extend(c["id"] for c in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/api/categories/database/components?limit=2&cursor={cursor}")
+
+    assert seen == expected
+    assert "x-next-cursor" not in client.get("/api/categories/database/components").headers
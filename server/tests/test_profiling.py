@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import pstats
+from datetime import timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+import profiling
+from metrics import instrument_engine
+from profiling import ProfilingMiddleware, slow_query_log, PROFILE_FILE_HEADER, PROFILE_HEADER
+from routers.auth import create_access_token
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def call(app, headers):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/components/1",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    asyncio.run(app(scope, None, send))
+    return dict((k.decode(), v.decode()) for k, v in messages[0]["headers"])
+
+
+def test_slow_queries_are_logged_with_route(caplog):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, observers=[slow_query_log(threshold_ms=0.000001)])
+    scope = {"method": "GET", "route": SimpleNamespace(path="/api/components/{component_id}")}
+    token = profiling._current_scope.set(scope)
+    try:
+        with caplog.at_level(logging.WARNING, logger="slow_queries"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+    finally:
+        profiling._current_scope.reset(token)
+    engine.dispose()
+
+    assert any(
+        "GET /api/components/{component_id}: SELECT 1" in record.getMessage() for record in caplog.records
+    )
+
+
+def test_fast_queries_are_not_logged(caplog):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, observers=[slow_query_log(threshold_ms=10_000)])
+    with caplog.at_level(logging.WARNING, logger="slow_queries"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    engine.dispose()
+    assert not caplog.records
+
+
+def test_slow_query_log_can_be_disabled():
+    assert slow_query_log(threshold_ms=0) is None
+
+
+async def allow_good(token):
+    return token == "good"
+
+
+async def allow_any(token):
+    return True
+
+
+def test_profile_header_writes_stats_for_admins(tmp_path):
+    app = ProfilingMiddleware(ok_app, authorize=allow_good, profile_dir=str(tmp_path))
+
+    headers = call(app, {"X-Foundry-Profile": "1", "Authorization": "Bearer good"})
+    filename = headers[PROFILE_FILE_HEADER.lower()]
+    assert (tmp_path / filename).exists()
+    pstats.Stats(str(tmp_path / filename))
+
+    assert PROFILE_FILE_HEADER.lower() not in call(app, {"X-Foundry-Profile": "1", "Authorization": "Bearer bad"})
+    assert PROFILE_FILE_HEADER.lower() not in call(app, {"X-Foundry-Profile": "1"})
+    assert PROFILE_FILE_HEADER.lower() not in call(app, {"Authorization": "Bearer good"})
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_sampled_requests_are_profiled(tmp_path):
+    app = ProfilingMiddleware(
+        ok_app, authorize=allow_any, profile_dir=str(tmp_path), sample_rate=1.0
+    )
+    assert PROFILE_FILE_HEADER.lower() in call(app, {"Authorization": "Bearer any"})
+
+
+def test_admin_stats_report_profiling(client, admin_token):
+    response = client.get("/api/admin/stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json()["profiling"]["slow_query_ms"] == profiling.SLOW_QUERY_MS
+
+
+def test_tokens_of_missing_admins_are_not_profiled(client):
+    # Correctly signed and unexpired, but no such admin exists any more
+    token = create_access_token("deleted", 999999, timedelta(minutes=5))
+    response = client.get(
+        "/api/categories", headers={PROFILE_HEADER: "1", "Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert PROFILE_FILE_HEADER.lower() not in response.headers
@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import async_engine
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # The catalog version header re-reads its counter whenever its TTL lapses,
+        # which would make exact counts depend on timing
+        if "catalog_version" not in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def create_components(client, admin_token, count, category="frontend"):
+    for i in range(count):
+        client.post(
+            "/api/admin/components",
+            json={
+                "title": f"Query Count Component {i}",
+                "use_case": "Component used to measure page query counts",
+                "category": category
+            },
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+
+def test_public_list_query_count_is_constant(client, admin_token):
+    create_components(client, admin_token, 5)
+
+    with count_queries() as small_page:
+        response = client.get("/api/components?limit=1")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    with count_queries() as large_page:
+        response = client.get("/api/components?limit=5")
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+    assert len(large_page) == len(small_page)
+
+
+def test_admin_list_query_count_is_constant(client, admin_token):
+    create_components(client, admin_token, 5, category="backend")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    with count_queries() as small_page:
+        response = client.get("/api/admin/components?limit=1", headers=headers)
+    assert response.status_code == 200
+
+    with count_queries() as large_page:
+        response = client.get("/api/admin/components?limit=5", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+    assert len(large_page) == len(small_page)
+
+
+def test_category_list_query_count_is_constant(client, admin_token):
+    create_components(client, admin_token, 3, category="devops")
+
+    with count_queries() as statements:
+        response = client.get("/api/categories/devops/components")
+    assert response.status_code == 200
+    assert len(response.json()) >= 3
+    assert all(c["category"] == "DevOps & Cloud" for c in response.json())
+
+    assert len(statements) == 1
+
+
+def test_create_component_does_not_query_categories(client, admin_token):
+    with count_queries() as statements:
+        response = client.post(
+            "/api/admin/components",
+            json={
+                "title": "Category Map Component",
+                "use_case": "Created without looking categories up",
+                "category": "database"
+            },
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+    assert response.status_code == 201
+    assert response.json()["category"] == "Database"
+
+    assert not [s for s in statements if "categories" in s]
+
+
+def test_update_component_category_resolves_from_map(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    created = client.post(
+        "/api/admin/components",
+        json={
+            "title": "Moving Component",
+            "use_case": "Component that changes category",
+            "category": "frontend"
+        },
+        headers=headers
+    ).json()
+
+    with count_queries() as statements:
+        response = client.put(
+            f"/api/admin/components/{created['id']}",
+            json={"category": "backend"},
+            headers=headers
+        )
+    assert response.json()["category"] == "Backend"
+    assert not [s for s in statements if "categories" in s]
+
+    listing = client.get("/api/categories/backend/components").json()
+    assert created["id"] in [c["id"] for c in listing]
+
+
+def test_category_counts_use_one_grouped_query(client, admin_token):
+    before = {c["name"]: c["component_count"] for c in client.get("/api/categories?include_counts=true").json()}
+    create_components(client, admin_token, 2, category="frontend")
+
+    with count_queries() as statements:
+        response = client.get("/api/categories?include_counts=true")
+    assert response.status_code == 200
+    counts = {c["name"]: c["component_count"] for c in response.json()}
+
+    assert counts["Frontend"] == before["Frontend"] + 2
+    assert set(counts) == {"Frontend", "Backend", "Database", "DevOps & Cloud"}
+    assert len(statements) == 1
+    assert "GROUP BY" in statements[0]
+    assert "component_count" not in client.get("/api/categories").json()[0]
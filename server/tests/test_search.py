@@ -0,0 +1,71 @@
+import uuid
+
+from search import build_match_query, render_highlight
+
+
+def create_searchable_component(client, admin_token, word):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    create = client.post(
+        "/api/admin/components",
+        json={
+            "title": f"Searchable {word}",
+            "use_case": "Component used to exercise full-text search",
+            "category": "backend"
+        },
+        headers=headers
+    )
+    component_id = create.json()["id"]
+    snippet = client.post(
+        f"/api/admin/components/{component_id}/snippets",
+        json={"filename": "app.py", "language": "python", "code": f"def {word}_handler(): pass"},
+        headers=headers
+    )
+    return component_id, snippet.json()["id"]
+
+
+def test_build_match_query_quotes_terms():
+    assert build_match_query('foo "bar') == '"foo" """bar"*'
+    assert build_match_query("   ") is None
+
+
+def test_render_highlight_escapes_html():
+    assert render_highlight("<b>\x02x\x03") == "&lt;b&gt;<mark>x</mark>"
+
+
+def test_search_finds_components_and_snippets(client, admin_token):
+    word = f"zebra{uuid.uuid4().hex[:8]}"
+    component_id, snippet_id = create_searchable_component(client, admin_token, word)
+
+    response = client.get(f"/api/search?q={word}")
+
+    assert response.status_code == 200
+    hits = {(r["kind"], r["component_id"], r["snippet_id"]) for r in response.json()}
+    assert ("component", component_id, None) in hits
+    assert ("snippet", component_id, snippet_id) in hits
+
+
+def test_search_filters_by_category_and_language(client, admin_token):
+    word = f"yak{uuid.uuid4().hex[:8]}"
+    create_searchable_component(client, admin_token, word)
+
+    assert client.get(f"/api/search?q={word}&category=frontend").json() == []
+    results = client.get(f"/api/search?q={word}&language=python").json()
+    assert [r["kind"] for r in results] == ["snippet"]
+    assert "<mark>" in results[0]["highlight"]
+
+
+def test_search_index_follows_snippet_writes(client, admin_token):
+    word = f"okapi{uuid.uuid4().hex[:8]}"
+    _, snippet_id = create_searchable_component(client, admin_token, word)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    client.put(f"/api/admin/snippets/{snippet_id}", json={"code": "replaced body"}, headers=headers)
+    assert client.get(f"/api/search?q={word}&language=python").json() == []
+
+    client.delete(f"/api/admin/snippets/{snippet_id}", headers=headers)
+    results = client.get("/api/search?q=replaced&limit=100").json()
+    assert all(r["snippet_id"] != snippet_id for r in results)
+
+
+def test_search_rejects_unknown_category(client):
+    assert client.get("/api/search?q=x&category=mobile").status_code == 400
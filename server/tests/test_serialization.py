@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Response
+
+import serialization
+from serialization import dumps, json_bytes_response
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(serialization, "FAST_JSON", True)
+
+
+def test_dumps_matches_fastapi_datetime_format():
+    assert dumps({"at": datetime(2024, 1, 2, 3, 4, 5)}) == b'{"at":"2024-01-02T03:04:05"}'
+    assert dumps({"at": datetime(2024, 1, 2, 3, 4, 5, 120)}) == b'{"at":"2024-01-02T03:04:05.000120"}'
+
+
+def test_json_bytes_response_keeps_injected_headers():
+    injected = Response()
+    injected.headers["ETag"] = '"abc"'
+    encoded = json_bytes_response([{"id": 1}], injected)
+    assert encoded.body == b'[{"id":1}]'
+    assert encoded.headers["etag"] == '"abc"'
+    assert encoded.headers["content-type"] == "application/json"
+
+
+def test_fast_path_returns_identical_payloads(client, admin_token, monkeypatch):
+    from tests.test_query_counts import create_components
+    create_components(client, admin_token, 3, category="backend")
+
+    slow_list = client.get("/api/components?limit=2")
+    slow_category = client.get("/api/categories/backend/components")
+
+    monkeypatch.setattr(serialization, "FAST_JSON", True)
+    fast_list = client.get("/api/components?limit=2")
+    fast_category = client.get("/api/categories/backend/components")
+
+    assert fast_list.json() == slow_list.json()
+    assert fast_list.headers["etag"] == slow_list.headers["etag"]
+    assert fast_list.headers["x-next-cursor"] == slow_list.headers["x-next-cursor"]
+    assert fast_category.json() == slow_category.json()
+
+
+def test_fast_path_still_answers_conditional_requests(client, fast_json):
+    first = client.get("/api/categories")
+    revalidated = client.get("/api/categories", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
@@ -0,0 +1,60 @@
+import gzip
+import json
+import os
+
+from database import engine
+from snapshot import build_snapshot
+from tests.test_snippets import create_component_with_snippet
+
+
+def snapshot_json(root, relative):
+    with open(os.path.join(root, relative), "rb") as handle:
+        body = handle.read()
+    with open(os.path.join(root, relative + ".gz"), "rb") as handle:
+        assert gzip.decompress(handle.read()) == body
+    return json.loads(body)
+
+
+def test_snapshot_matches_api(client, admin_token, tmp_path):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+    root = str(tmp_path)
+    build_snapshot(engine, root, page_size=2)
+
+    pairs = {
+        "/api/categories": "api/categories/index.json",
+        "/api/categories?include_counts=true": "api/categories/counts.json",
+        "/api/components?limit=2": "api/components/index.json",
+        "/api/components?skip=2&limit=2": "api/components/skip/2.json",
+        "/api/categories/devops/components": "api/categories/devops/components/index.json",
+        f"/api/components/{component_id}": f"api/components/{component_id}/index.json",
+        f"/api/components/{component_id}?fields=summary": f"api/components/{component_id}/summary.json",
+        f"/api/components/{component_id}?render=html": f"api/components/{component_id}/html.json",
+        "/api/catalog/version": "api/catalog/version/index.json",
+    }
+    for url, relative in pairs.items():
+        assert snapshot_json(root, relative) == client.get(url).json(), url
+
+    cursor = client.get("/api/components?limit=2").headers["x-next-cursor"]
+    assert snapshot_json(root, f"api/components/cursor/{cursor}.json") == client.get(
+        f"/api/components?limit=2&cursor={cursor}"
+    ).json()
+
+
+def test_snapshot_is_incremental(client, admin_token, tmp_path):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    changed_id, _ = create_component_with_snippet(client, admin_token)
+    deleted_id, _ = create_component_with_snippet(client, admin_token)
+    root = str(tmp_path)
+    assert build_snapshot(engine, root)["details"] > 2
+
+    # Nothing committed since the last run
+    assert build_snapshot(engine, root)["written"] == 0
+
+    client.put(f"/api/admin/components/{changed_id}", json={"title": "Renamed Manifest"}, headers=headers)
+    client.delete(f"/api/admin/components/{deleted_id}", headers=headers)
+    result = build_snapshot(engine, root)
+    assert result["details"] == 1
+    # The deleted detail, plus any listing page the shorter catalog no longer needs
+    assert result["removed"] >= 1
+    assert snapshot_json(root, f"api/components/{changed_id}/index.json")["title"] == "Renamed Manifest"
+    assert not os.path.exists(os.path.join(root, f"api/components/{deleted_id}"))
@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from migrations import migrate
+from snippets import RangeNotSatisfiable, parse_range, snippet_metadata
+from tests.test_query_counts import count_queries
+
+MANIFEST = "apiVersion: v1\nkind: Service\nmetadata:\n  name: api\n"
+
+
+def create_component_with_snippet(client, admin_token, code=MANIFEST):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    component = client.post(
+        "/api/admin/components",
+        json={
+            "title": "Service Manifest",
+            "use_case": "Kubernetes service definition",
+            "category": "devops"
+        },
+        headers=headers
+    ).json()
+    snippet = client.post(
+        f"/api/admin/components/{component['id']}/snippets",
+        json={"filename": "service.yaml", "language": "yaml", "code": code},
+        headers=headers
+    ).json()
+    return component["id"], snippet["id"]
+
+
+def test_snippet_metadata():
+    metadata = snippet_metadata("a\nb\n")
+    assert metadata["byte_size"] == 4
+    assert metadata["line_count"] == 2
+    assert snippet_metadata("a\nb")["line_count"] == 2
+    assert snippet_metadata("é")["byte_size"] == 2
+    assert len(metadata["content_hash"]) == 64
+
+
+def test_parse_range():
+    assert parse_range(None, 10) is None
+    assert parse_range("bytes=0-3", 10) == (0, 3)
+    assert parse_range("bytes=4-", 10) == (4, 9)
+    assert parse_range("bytes=-3", 10) == (7, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=10-", 10)
+
+
+def test_summary_detail_skips_snippet_bodies(client, admin_token):
+    component_id, _ = create_component_with_snippet(client, admin_token)
+
+    with count_queries() as statements:
+        response = client.get(f"/api/components/{component_id}?fields=summary")
+    assert response.status_code == 200
+    snippet = response.json()["snippets"][0]
+    assert "code" not in snippet
+    assert snippet["byte_size"] == len(MANIFEST)
+    assert snippet["line_count"] == 4
+    assert snippet["content_hash"] == snippet_metadata(MANIFEST)["content_hash"]
+    assert not [s for s in statements if "snippet_blobs.code" in s]
+
+    full = client.get(f"/api/components/{component_id}")
+    assert full.json()["snippets"][0]["code"] == MANIFEST
+    assert full.headers["etag"] != response.headers["etag"]
+
+
+def test_raw_snippet_supports_ranges(client, admin_token):
+    _, snippet_id = create_component_with_snippet(client, admin_token)
+
+    full = client.get(f"/api/snippets/{snippet_id}/raw")
+    assert full.status_code == 200
+    assert full.headers["content-type"].startswith("text/plain")
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.text == MANIFEST
+
+    partial = client.get(f"/api/snippets/{snippet_id}/raw", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.text == MANIFEST[:10]
+    assert partial.headers["content-range"] == f"bytes 0-9/{len(MANIFEST)}"
+
+    stale = client.get(
+        f"/api/snippets/{snippet_id}/raw",
+        headers={"Range": "bytes=0-9", "If-Range": '"outdated"'}
+    )
+    assert stale.status_code == 200
+
+    unsatisfiable = client.get(f"/api/snippets/{snippet_id}/raw", headers={"Range": "bytes=9999-"})
+    assert unsatisfiable.status_code == 416
+
+    revalidated = client.get(
+        f"/api/snippets/{snippet_id}/raw",
+        headers={"If-None-Match": full.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_raw_snippet_not_found(client):
+    assert client.get("/api/snippets/999999/raw").status_code == 404
+
+
+def test_out_of_range_ids_are_rejected(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    too_big = 2 ** 64
+    assert client.get(f"/api/snippets/{too_big}/raw").status_code == 422
+    assert client.get(f"/api/components/{too_big}").status_code == 422
+    assert client.get(f"/api/admin/components/{too_big}", headers=headers).status_code == 422
+    assert client.delete(f"/api/admin/snippets/{too_big}", headers=headers).status_code == 422
+
+
+def test_migration_backfills_snippet_metadata(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE code_snippets (id INTEGER PRIMARY KEY, filename VARCHAR(255), "
+            "language VARCHAR(50), code TEXT, component_id INTEGER, created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO code_snippets (filename, language, code, component_id) "
+            "VALUES ('main.tf', 'hcl', 'resource {}\n', 1)"
+        ))
+
+    assert "snippet_metadata" in migrate(engine)
+    assert "snippet_metadata" not in migrate(engine)
+
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT byte_size, line_count, content_hash FROM code_snippets")).one()
+    assert tuple(row) == (12, 1, snippet_metadata("resource {}\n")["content_hash"])
+    engine.dispose()
@@ -0,0 +1,75 @@
+from sqlalchemy import text
+
+from cache import response_cache
+from database import engine
+from versioning import VersionTracker
+
+
+def catalog_version(client):
+    return client.get("/api/catalog/version").json()["version"]
+
+
+def test_admin_writes_bump_version(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    before = catalog_version(client)
+
+    component = client.post(
+        "/api/admin/components",
+        json={"title": "Versioned", "use_case": "Version counter", "category": "backend"},
+        headers=headers
+    ).json()
+    snippet = client.post(
+        f"/api/admin/components/{component['id']}/snippets",
+        json={"filename": "main.py", "language": "python", "code": "print('v')\n"},
+        headers=headers
+    ).json()
+    client.put(f"/api/admin/snippets/{snippet['id']}", json={"code": "print('w')\n"}, headers=headers)
+    client.delete(f"/api/admin/components/{component['id']}", headers=headers)
+    assert catalog_version(client) == before + 4
+
+    # Rejected writes leave the counter alone
+    client.delete(f"/api/admin/components/{component['id']}", headers=headers)
+    assert catalog_version(client) == before + 4
+
+
+def test_header_on_public_routes_only(client, admin_token):
+    version = catalog_version(client)
+    for path in ("/api/categories", "/api/components", "/api/catalog/version"):
+        assert client.get(path).headers["x-catalog-version"] == str(version)
+    admin = client.get("/api/admin/stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert "x-catalog-version" not in admin.headers
+
+
+def test_version_endpoint_supports_conditional_polling(client):
+    response = client.get("/api/catalog/version")
+    assert response.headers["etag"] == f'"{response.json()["version"]}"'
+    assert client.get("/api/catalog/version", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_write_from_another_worker_clears_response_cache(client):
+    client.get("/api/categories")
+    assert len(response_cache) > 0
+    before = catalog_version(client)
+
+    # Another worker's transaction, committed outside this process's sessions
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE catalog_version SET version = version + 1 WHERE id = 1"))
+
+    response = client.get("/api/catalog/version")
+    assert response.json()["version"] == before + 1
+    assert len(response_cache) == 0
+    assert client.get("/api/categories").headers["x-catalog-version"] == str(before + 1)
+
+
+def test_tracker_only_signals_changes_from_elsewhere():
+    changes = []
+    tracker = VersionTracker(ttl_seconds=1, on_change=lambda: changes.append(True))
+    tracker.observe(3)
+    tracker.observe(4, committed_here=True)
+    tracker.observe(4)
+    assert changes == []
+    tracker.observe(6, committed_here=True)
+    tracker.observe(7)
+    assert len(changes) == 2
+    tracker.observe(5)
+    assert tracker.version == 7
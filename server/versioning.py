@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+from cache import response_cache
+from model import CatalogVersion
+
+# How long a worker trusts its last read of the shared counter before asking the database again
+CATALOG_VERSION_TTL_SECONDS = float(os.environ.get('FOUNDRY_CATALOG_VERSION_TTL_SECONDS', '1'))
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+CATALOG_VERSION_ROW = 1
+
+# Prefixes of routes that change the catalog or belong to an admin; everything else under /api/ is public
+PRIVATE_PREFIXES = ("/api/admin", "/api/auth")
+
+
+async def bump_catalog_version(db) -> int:
+    """Increment the catalog version inside the caller's transaction, returning the new value"""
+    # The row update takes the write lock, so concurrent writers in any worker get distinct versions
+    version = (
+        await db.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == CATALOG_VERSION_ROW)
+            .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+            .returning(CatalogVersion.version)
+            .execution_options(synchronize_session=False)
+        )
+    ).scalar_one()
+    db.info["catalog_version"] = version
+    return version
+
+
+def catalog_version_query():
+    return select(CatalogVersion.version, CatalogVersion.updated_at).where(CatalogVersion.id == CATALOG_VERSION_ROW)
+
+
+async def read_catalog_version(conn):
+    """The (version, updated_at) row as committed in the shared database"""
+    return (await conn.execute(catalog_version_query())).one()
+
+
+class VersionTracker:
+    """This worker's view of the catalog version, refreshed from the database at most once per TTL"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = CATALOG_VERSION_TTL_SECONDS,
+        on_change: Optional[Callable[[], None]] = None,
+        clock=time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.on_change = on_change
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = None
+        self._refreshing = False
+        self.refreshes = 0
+        self.remote_changes = 0
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def observe(self, version: int, committed_here: bool = False):
+        """Record a version read from the database or just committed by this worker"""
+        with self._lock:
+            previous = self._version
+            self._checked_at = self._clock()
+            if previous is not None and version <= previous:
+                return
+            self._version = version
+            # A commit from this worker that follows the last known version already
+            # invalidated its own cache entries; any other jump came from another worker
+            if previous is None or (committed_here and version == previous + 1):
+                return
+            self.remote_changes += 1
+        if self.on_change is not None:
+            self.on_change()
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            return self._checked_at is not None and self._clock() - self._checked_at < self.ttl_seconds
+
+    async def current(self, connect) -> int:
+        """The catalog version, reading it through connect() when the cached value has expired"""
+        if self._version is not None and (self.is_fresh() or self._refreshing):
+            return self._version
+        self._refreshing = True
+        try:
+            async with connect() as conn:
+                version, _ = await read_catalog_version(conn)
+            self.refreshes += 1
+        finally:
+            self._refreshing = False
+        self.observe(version)
+        return self._version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self._version,
+                "ttl_seconds": self.ttl_seconds,
+                "refreshes": self.refreshes,
+                "remote_changes": self.remote_changes
+            }
+
+
+# Another worker changed the catalog, so any cached response here may be stale
+version_tracker = VersionTracker(on_change=response_cache.clear)
+
+
+@event.listens_for(Session, "after_commit")
+def record_committed_version(session):
+    version = session.info.pop("catalog_version", None)
+    if version is not None:
+        version_tracker.observe(version, committed_here=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_uncommitted_version(session):
+    session.info.pop("catalog_version", None)
+
+
+class CatalogVersionMiddleware:
+    """ASGI middleware adding the catalog version header to public API responses"""
+
+    def __init__(self, app, connect, tracker: VersionTracker = version_tracker):
+        self.app = app
+        self.connect = connect
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if not path.startswith("/api/") or path.startswith(PRIVATE_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        # Read before the handler runs, so the body reflects this version or a later one
+        # and a client polling with the header never skips a change
+        version = str(await self.tracker.current(self.connect))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"])[CATALOG_VERSION_HEADER] = version
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)